@@ -54,34 +54,35 @@ def analyze_deck_composition(decks_df: Dict[str, pd.DataFrame]) -> Dict[str, Dic
             continue
         
         # Basic counts
-        creatures = deck_df[deck_df['Type'].str.contains('Creature', case=False, na=False)]
-        lands = deck_df[deck_df['Type'].str.contains('Land', case=False, na=False)]
-        other_spells = deck_df[~deck_df['Type'].str.contains('Creature|Land', case=False, na=False)]
+        card_types = deck_df['Type'].str.lower()
+        is_creature = card_types.str.contains('creature', na=False, regex=False)
+        is_land = card_types.str.contains('land', na=False, regex=False)
         
-        # Color analysis
+        # Color analysis: any listed card color containing each color letter
         colors = set()
-        for _, card in deck_df.iterrows():
-            if pd.notna(card.get('Color', '')):
-                color = str(card['Color'])
-                # Parse individual colors from the Color column
-                for magic_color in MagicColor.all_colors():
-                    if magic_color in color:
-                        colors.add(magic_color)
-        
-        # CMC analysis
-        cmcs = []
-        for _, card in deck_df.iterrows():
-            cmc = card.get('CMC', 0)  # Use 'CMC' instead of 'cmc'
-            if pd.notna(cmc) and isinstance(cmc, (int, float)):
-                cmcs.append(float(cmc))
+        if 'Color' in deck_df.columns:
+            color_text = deck_df['Color'].dropna().astype(str)
+            colors = {magic_color for magic_color in MagicColor.all_colors()
+                      if color_text.str.contains(magic_color, regex=False).any()}
         
+        # CMC analysis: numeric columns average their non-missing values, other columns
+        # only their int/float entries; a deck without a CMC column averages 0
+        if 'CMC' not in deck_df.columns:
+            avg_cmc = 0.0
+        else:
+            if pd.api.types.is_numeric_dtype(deck_df['CMC']):
+                cmcs = deck_df['CMC'].dropna()
+            else:
+                cmcs = deck_df['CMC'][deck_df['CMC'].map(lambda cmc: isinstance(cmc, (int, float)) and pd.notna(cmc))]
+            avg_cmc = float(cmcs.astype(float).mean()) if len(cmcs) else 0.0
+
         analysis[theme_name] = {
             'total_cards': len(deck_df),
-            'creatures': len(creatures),
-            'lands': len(lands), 
-            'other_spells': len(other_spells),
+            'creatures': int(is_creature.sum()),
+            'lands': int(is_land.sum()), 
+            'other_spells': int((~(is_creature | is_land)).sum()),
             'colors': sorted(list(colors)),
-            'avg_cmc': sum(cmcs) / len(cmcs) if cmcs else 0.0
+            'avg_cmc': avg_cmc
         }
     
     return analysis
@@ -1,9 +1,15 @@
 """Main theme extraction functionality."""
 
-from typing import Dict, List, Set, Tuple, Any, Optional
+from typing import Dict, FrozenSet, List, Set, Tuple, Any, Optional
 import pandas as pd
 from collections import Counter, defaultdict
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from operator import itemgetter
+import heapq
 import re
+import sys
 import numpy as np
 from ..enums import Archetype, MagicColor
 from ..scorer import (
@@ -12,14 +18,227 @@ from ..scorer import (
     create_control_scorer
 )
 from .keywords import *
+from . import keywords as keyword_tables
+
+
+# Archetypes that are easier / harder to build into a complete deck
+_EASY_ARCHETYPES = frozenset({Archetype.AGGRO, Archetype.MIDRANGE, Archetype.TRIBAL})
+_HARD_ARCHETYPES = frozenset({Archetype.CONTROL, Archetype.COMBO})
+
+
+def _score_weights(prioritize_buildability: bool, diversity_weight: float) -> Tuple[float, float, float]:
+    """Get the (buildability, diversity, balance) score weights for a selection run."""
+    w_build = 0.7 if prioritize_buildability else 0.5
+    return w_build, diversity_weight, 1.0 - diversity_weight - w_build
+
+
+def _score_batch(buildability: np.ndarray, diversity: np.ndarray, balance: np.ndarray,
+                 weights: Tuple[float, float, float]) -> np.ndarray:
+    """Combine per-theme feature arrays into weighted selection scores in one pass."""
+    w_build, w_div, w_balance = weights
+    return buildability * w_build + diversity * w_div + balance * w_balance
+
+
+# (name, keywords, archetype, scorer) for every keyword-density theme category
+_KEYWORD_THEME_CATEGORIES = (
+    ('Equipment', EQUIPMENT_KEYWORDS, Archetype.EQUIPMENT, create_equipment_scorer),
+    ('Aggro', AGGRESSIVE_KEYWORDS, Archetype.AGGRO, create_aggressive_scorer),
+    ('Control', CONTROL_KEYWORDS, Archetype.CONTROL, create_control_scorer),
+    ('Ramp', RAMP_KEYWORDS, Archetype.RAMP, create_default_scorer),
+    ('Tempo', TEMPO_KEYWORDS, Archetype.TEMPO, create_aggressive_scorer),
+    ('Combo', COMBO_KEYWORDS, Archetype.COMBO, create_default_scorer),
+    ('Voltron', VOLTRON_KEYWORDS, Archetype.VOLTRON, create_equipment_scorer),
+    ('Aristocrats', ARISTOCRATS_KEYWORDS, Archetype.ARISTOCRATS, create_default_scorer),
+    ('Graveyard', GRAVEYARD_KEYWORDS, Archetype.GRAVEYARD, create_default_scorer),
+    ('Burn', BURN_KEYWORDS, Archetype.BURN, create_aggressive_scorer),
+    ('Spellslinger', SPELLSLINGER_KEYWORDS, Archetype.SPELLSLINGER, create_default_scorer),
+    ('Lifegain', LIFEGAIN_KEYWORDS, Archetype.LIFEGAIN, create_default_scorer),
+    ('Tokens', TOKEN_KEYWORDS, Archetype.TOKENS, create_default_scorer),
+    ('Enchantments', ENCHANTMENTS_KEYWORDS, Archetype.ENCHANTMENTS, create_default_scorer),
+    ('Counters', COUNTERS_KEYWORDS, Archetype.COUNTERS, create_default_scorer),
+    ('Mill', MILL_KEYWORDS, Archetype.MILL, create_default_scorer),
+    ('Landfall', LANDFALL_KEYWORDS, Archetype.LANDFALL, create_default_scorer),
+    ('Cycling', CYCLING_KEYWORDS, Archetype.CYCLING, create_default_scorer),
+    ('Madness', MADNESS_KEYWORDS, Archetype.MADNESS, create_default_scorer),
+    ('Midrange', MIDRANGE_KEYWORDS, Archetype.MIDRANGE, create_default_scorer),
+    ('Vehicles', VEHICLES_KEYWORDS, Archetype.VEHICLES, create_default_scorer),
+    ('Planeswalkers', PLANESWALKERS_KEYWORDS, Archetype.PLANESWALKERS, create_default_scorer),
+    ('Historic', HISTORIC_KEYWORDS, Archetype.HISTORIC, create_default_scorer),
+    ('Kicker', KICKER_KEYWORDS, Archetype.KICKER, create_default_scorer),
+    ('Multicolor', MULTICOLOR_KEYWORDS, Archetype.MULTICOLOR, create_default_scorer),
+    ('Blink', BLINK_KEYWORDS, Archetype.BLINK, create_default_scorer),
+    ('Sacrifice', SACRIFICE_KEYWORDS, Archetype.SACRIFICE, create_default_scorer),
+    ('Storm', STORM_KEYWORDS, Archetype.STORM, create_default_scorer),
+    ('Infect', INFECT_KEYWORDS, Archetype.INFECT, create_aggressive_scorer),
+    ('Reanimator', REANIMATOR_KEYWORDS, Archetype.REANIMATOR, create_default_scorer),
+    ('Slivers', SLIVERS_KEYWORDS, Archetype.SLIVERS, create_tribal_scorer),
+    ('Eldrazi', ELDRAZI_KEYWORDS, Archetype.ELDRAZI, create_default_scorer),
+    ('Energy', ENERGY_KEYWORDS, Archetype.ENERGY, create_default_scorer),
+    ('Devotion', DEVOTION_KEYWORDS, Archetype.DEVOTION, create_default_scorer),
+    ('Affinity', AFFINITY_KEYWORDS, Archetype.AFFINITY, create_artifact_scorer),
+)
+
+
+# Best archetype for each guild's identity
+_GUILD_ARCHETYPES = {
+    'Azorius': Archetype.CONTROL,      # U/W - Control
+    'Dimir': Archetype.CONTROL,        # U/B - Control/Mill
+    'Rakdos': Archetype.AGGRO,         # B/R - Aggro/Burn
+    'Gruul': Archetype.AGGRO,          # R/G - Aggro/Ramp
+    'Selesnya': Archetype.MIDRANGE,    # G/W - Tokens/Midrange
+    'Orzhov': Archetype.MIDRANGE,      # B/W - Lifegain/Midrange
+    'Izzet': Archetype.TEMPO,          # U/R - Spells/Tempo
+    'Golgari': Archetype.MIDRANGE,     # B/G - Graveyard/Midrange
+    'Boros': Archetype.AGGRO,          # R/W - Aggro/Equipment
+    'Simic': Archetype.RAMP            # G/U - Ramp/Value
+}
+
+# Guild-specific keywords based on the guild identity
+_GUILD_KEYWORDS = {
+    'Azorius': ('flying', 'counter', 'detain', 'control', 'flying creatures'),
+    'Dimir': ('mill', 'graveyard', 'card draw', 'control', 'surveillance'),
+    'Rakdos': ('haste', 'aggressive', 'damage', 'sacrifice', 'unleash'),
+    'Gruul': ('trample', 'haste', 'power matters', 'bloodrush', 'ramp'),
+    'Selesnya': ('tokens', 'populate', 'convoke', 'creatures matter', 'anthem'),
+    'Orzhov': ('lifegain', 'extort', 'removal', 'aristocrats', 'afterlife'),
+    'Izzet': ('instant', 'sorcery', 'spells matter', 'card draw', 'overload'),
+    'Golgari': ('graveyard', 'scavenge', 'dredge', 'sacrifice', 'undergrowth'),
+    'Boros': ('equipment', 'battalion', 'mentor', 'aggressive', 'combat'),
+    'Simic': ('card draw', 'ramp', 'evolve', 'adapt', '+1/+1 counters')
+}
+
+# Scorer for each guild archetype
+_GUILD_SCORERS = {
+    Archetype.AGGRO: create_aggressive_scorer,
+    Archetype.CONTROL: create_control_scorer,
+    Archetype.MIDRANGE: create_default_scorer,
+    Archetype.TEMPO: create_aggressive_scorer,
+    Archetype.RAMP: create_default_scorer
+}
+
+
+# Minimum matching cards for each kind of per-color theme
+_MIN_TRIBAL_CARDS = 8
+_MIN_KEYWORD_CARDS = 10
+_MIN_CHEAP_CARDS = 15
+_MIN_EXPENSIVE_CARDS = 8
+
+
+# Tribal types in matrix column order, and each type's column
+_TRIBAL_TYPE_LIST = tuple(sorted(TRIBAL_TYPES))
+_TRIBAL_TYPE_INDEX = {creature_type: i for i, creature_type in enumerate(_TRIBAL_TYPE_LIST)}
+
+
+# Extra keywords for tribal themes of these creature types
+_TRIBAL_TYPE_KEYWORDS = {
+    'soldier': ('anthem', 'pump', 'attack', 'vigilance', 'first strike'),
+    'wizard': ('instant', 'sorcery', 'prowess', 'draw', 'counter'),
+    'goblin': ('haste', 'sacrifice', 'token', 'aggressive'),
+    'elf': ('mana', 'tap', 'forest', 'add', 'produces'),
+    'zombie': ('graveyard', 'return', 'sacrifice', 'dies'),
+    'angel': ('flying', 'vigilance', 'lifelink', 'protection'),
+    'dragon': ('flying', 'expensive', 'power', 'trample', 'haste'),
+    'beast': ('power', 'toughness', 'trample', 'fight'),
+}
+
+
+# Single-letter color codes accepted when parsing a Color value
+_COLOR_LETTERS = frozenset('WUBRG')
+
+
+# Full names for single colors and two-color guilds (keyed by sorted color pair)
+_COLOR_NAMES = {'W': 'White', 'U': 'Blue', 'B': 'Black', 'R': 'Red', 'G': 'Green'}
+_GUILD_NAMES = {
+    ('B', 'G'): 'Golgari', ('G', 'W'): 'Selesnya', ('R', 'W'): 'Boros',
+    ('B', 'R'): 'Rakdos', ('G', 'U'): 'Simic', ('R', 'U'): 'Izzet',
+    ('B', 'W'): 'Orzhov', ('G', 'R'): 'Gruul', ('U', 'W'): 'Azorius',
+    ('B', 'U'): 'Dimir'
+}
+_COLOR_ENUM_VALUES = {
+    'W': MagicColor.WHITE.value,
+    'U': MagicColor.BLUE.value,
+    'B': MagicColor.BLACK.value,
+    'R': MagicColor.RED.value,
+    'G': MagicColor.GREEN.value
+}
+
+
+@lru_cache(maxsize=None)
+def _color_name(color: str) -> str:
+    """Get full color name from abbreviation."""
+    return _COLOR_NAMES.get(color.upper(), color.title())
+
+
+@lru_cache(maxsize=None)
+def _guild_name(colors: Tuple[str, ...]) -> str:
+    """Get guild name for two-color combination."""
+    color_key = tuple(sorted(c.upper() for c in colors))
+    return _GUILD_NAMES.get(color_key, f"{_color_name(colors[0])}-{_color_name(colors[1])}")
+
+
+@lru_cache(maxsize=None)
+def _color_enum_value(color: str) -> str:
+    """Convert color string to MagicColor enum value."""
+    return _COLOR_ENUM_VALUES.get(color.upper(), color.upper())
+
+
+@lru_cache(maxsize=None)
+def _strategy_diversity(strategy: str) -> float:
+    """Ratio of distinct words to total words in a strategy description."""
+    return len(frozenset(strategy.lower().split())) / max(len(strategy.split()), 1)
+
+
+@lru_cache(maxsize=None)
+def _short_colors(colors: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Normalize theme colors to short codes ('W' rather than 'MagicColor.W'), once per color tuple."""
+    return tuple(sys.intern(c.rsplit('.', 1)[-1]) for c in colors)
+
+
+@dataclass(slots=True, frozen=True)
+class _ThemeProfile:
+    """Fixed-field view of a theme dict with just what the selection scoring reads."""
+    colors: Tuple[str, ...]
+    color_set: FrozenSet[str]
+    archetype: Any
+    keywords: FrozenSet[str]
+    strategy: str
+    
+    @classmethod
+    def from_theme(cls, theme: Dict[str, Any]) -> '_ThemeProfile':
+        return cls(
+            colors=_short_colors(tuple(theme['colors'])),
+            color_set=frozenset(theme['colors']),
+            archetype=theme.get('archetype'),
+            keywords=frozenset(theme.get('keywords', [])),
+            strategy=theme.get('strategy', ''),
+        )
 
 
 class ThemeExtractor:
     """Extracts potential themes from oracle card data."""
+    
+    # Compiled once for the class: plain color-letter strings
+    _PLAIN_COLORS_RE = re.compile(r'[WUBRG]{1,5}')
+    
+    # Source columns the extractor reads; everything else in the caller's frame is left behind
+    _SOURCE_COLUMNS = ('name', 'Color', 'Type', 'Oracle Text', 'CMC')
 
     def __init__(self, oracle_df: pd.DataFrame):
         """Initialize with oracle DataFrame."""
-        self.oracle_df = oracle_df.copy()
+        # Copy only the columns we use, with a positional index so precomputed row masks
+        # line up with filtered frames
+        self.oracle_df = oracle_df[[c for c in self._SOURCE_COLUMNS if c in oracle_df.columns]].copy()
+        self.oracle_df.index = pd.RangeIndex(len(self.oracle_df))
+        self._buildability_cache: Dict[str, float] = {}
+        self._profile_cache: Dict[str, _ThemeProfile] = {}
+        # (diversity, balance) per theme name for the candidate pool being selected from
+        self._score_cache: Dict[str, Tuple[float, float]] = {}
+        self._color_filter_cache: Dict[FrozenSet[str], pd.DataFrame] = {}
+        # Row masks used for counting are bit-packed (1 bit per card)
+        self._packed_color_masks: Dict[FrozenSet[str], np.ndarray] = {}
+        self._keyword_masks: Dict[str, np.ndarray] = {}
+        self._regex_union_masks: Dict[FrozenSet[str], np.ndarray] = {}
+        self._keyword_set_masks: Dict[FrozenSet[str], np.ndarray] = {}
         self._preprocess_data()
     
     def _preprocess_data(self) -> None:
@@ -29,47 +248,94 @@ class ThemeExtractor:
         self.oracle_df['Type'] = self.oracle_df['Type'].fillna('').astype(str).str.lower()
         self.oracle_df['Color'] = self.oracle_df['Color'].fillna('').astype(str)
         
+        # Combined lowercase text that keyword matching scans, built once instead of per row
+        self.oracle_df['search_text'] = self.oracle_df['Oracle Text'] + ' ' + self.oracle_df['Type']
+        
+        # Token vocabulary of the search text: every distinct word once, with the rows using it
+        tokens = self.oracle_df['search_text'].str.split().explode().dropna()
+        self._token_codes, token_vocab = pd.factorize(tokens)
+        # Fixed-width string array so substring tests over the vocabulary run as one numpy ufunc
+        self._token_vocab = np.asarray(token_vocab, dtype=str)
+        self._token_rows = tokens.index.to_numpy()
+        
+        # One scan over all cards' text fills a bit-packed (keywords x cards) hit matrix for
+        # every literal keyword in the keyword sets; each row is that keyword's row mask
+        literal_keywords = keyword_tables.LITERAL_KEYWORDS
+        keyword_index = {keyword: i for i, keyword in enumerate(literal_keywords)}
+        hits = np.zeros((len(literal_keywords), len(self.oracle_df)), dtype=bool)
+        for row, keyword in scan_literal_keyword_rows(self.oracle_df['search_text'].tolist()):
+            hits[keyword_index[keyword], row] = True
+        self._keyword_masks.update(zip(literal_keywords, np.packbits(hits, axis=1)))
+        
         # Convert CMC to numeric, handling non-numeric values
         self.oracle_df['cmc_numeric'] = pd.to_numeric(self.oracle_df['CMC'], errors='coerce').fillna(0)
         
-        # Extract creature types
-        self.oracle_df['creature_types'] = self.oracle_df['Type'].apply(self._extract_creature_types)
+        # Extract creature types: the words between the first and second dash of creature type lines
+        # Only creature lines are split, on plain em dashes after folding '-' into '—'
+        is_creature = self.oracle_df['Type'].str.contains('creature', regex=False).to_numpy(dtype=bool)
+        subtypes = (self.oracle_df['Type'][is_creature].str.replace('-', '—', regex=False)
+                    .str.split('—', regex=False).str[1].fillna('').str.split())
+        creature_types = np.full(len(self.oracle_df), frozenset(), dtype=object)
+        creature_types[is_creature] = [frozenset(types) for types in subtypes]
+        self.oracle_df['creature_types'] = creature_types
+        
+        # One boolean column per tribal type so tribal counts are a single column sum
+        self._tribal_mask = np.zeros((len(self.oracle_df), len(_TRIBAL_TYPE_LIST)), dtype=bool)
+        # Flatten to (row, type id) pairs and set them in one scatter
+        type_ids = self.oracle_df['creature_types'].explode().map(_TRIBAL_TYPE_INDEX).dropna()
+        self._tribal_mask[type_ids.index.to_numpy(), type_ids.to_numpy(dtype=np.intp)] = True
         
         # Calculate derived metrics using numeric CMC
         self.oracle_df['is_expensive'] = self.oracle_df['cmc_numeric'] >= 5
         self.oracle_df['is_cheap'] = self.oracle_df['cmc_numeric'] <= 2
-    
-    def _extract_creature_types(self, type_line: str) -> Set[str]:
-        """Extract creature types from type line."""
-        if 'creature' not in type_line:
-            return set()
         
-        # Split on common delimiters and extract types after 'creature'
-        parts = re.split(r'[—\-]', type_line)
-        if len(parts) > 1:
-            subtypes = parts[1].strip().split()
-            return {t.strip() for t in subtypes if t.strip()}
-        return set()
+        # Parse each distinct Color string once into a canonical sorted key (e.g. 'BG', '' if colorless).
+        # Plain color-letter strings are recognized in one vectorized match; only the bracket,
+        # comma or space separated formats fall back to _parse_colors
+        distinct_colors = pd.Series(self.oracle_df['Color'].unique(), dtype=object)
+        color_letters = distinct_colors.str.strip().str.upper()
+        is_plain = color_letters.str.fullmatch(self._PLAIN_COLORS_RE)
+        color_keys = {
+            c: ''.join(sorted(set(letters if plain else self._parse_colors(c))))
+            for c, letters, plain in zip(distinct_colors, color_letters, is_plain)
+        }
+        color_key = self.oracle_df['Color'].map(color_keys).astype(str)
+        
+        # Low-cardinality strings become categoricals (categories kept in first-appearance order)
+        self.oracle_df['color_key'] = pd.Categorical(color_key, categories=color_key.unique())
+        self.oracle_df['Color'] = pd.Categorical(self.oracle_df['Color'], categories=self.oracle_df['Color'].unique())
+        if self.oracle_df['Type'].nunique() <= len(self.oracle_df) // 2:
+            self.oracle_df['Type'] = self.oracle_df['Type'].astype('category')
+        
+        # (categories x packed cards) keyword-category membership matrix, scanned once and
+        # sliced by color mask for every combination
+        self._category_masks = np.stack([self._keywords_mask(keywords) for _, keywords, _, _ in _KEYWORD_THEME_CATEGORIES])
+        
+        # Tribal and category counts for every color key at once: one-hot color keys times the
+        # (cards x types) and (cards x categories) hit matrices
+        color_keys_index = self.oracle_df['color_key'].cat.categories
+        self._color_key_index = {key: i for i, key in enumerate(color_keys_index)}
+        self._color_key_rows = np.arange(len(color_keys_index))[:, None] == self.oracle_df['color_key'].cat.codes.to_numpy()
+        self._color_key_rows.flags.writeable = False  # Row masks are shared by every caller
+        key_onehot = self._color_key_rows.astype(np.int64)
+        self._color_key_totals = key_onehot.sum(axis=1)
+        self._tribal_counts_by_key = key_onehot @ self._tribal_mask
+        category_hits = np.unpackbits(self._category_masks, axis=1, count=len(self.oracle_df))
+        self._category_counts_by_key = key_onehot @ category_hits.T
+        self._cmc_counts_by_key = key_onehot @ self.oracle_df[['is_cheap', 'is_expensive']].to_numpy(dtype=np.int64)
     
     def _get_color_combinations(self, min_cards: int = 5) -> List[Tuple[List[str], str]]:
         """Get all color combinations present in the data."""
-        color_counts = defaultdict(int)
-        
-        for _, card in self.oracle_df.iterrows():
-            colors = self._parse_colors(card['Color'])  # Use original column name
-            if colors:
-                color_key = tuple(sorted(colors))
-                color_counts[color_key] += 1
-        
-        # Return combinations with at least min_cards
+        # Cards per canonical color key were counted once during preprocessing (keys in order
+        # of first appearance); colorless is skipped
         valid_combinations = []
-        for colors, count in color_counts.items():
-            if count >= min_cards:
-                color_list = list(colors)
+        for color_key, count in zip(self._color_key_index, self._color_key_totals.tolist()):
+            if color_key and count >= min_cards:
+                color_list = list(color_key)
                 if len(color_list) == 1:
-                    name_prefix = self._get_color_name(color_list[0])
+                    name_prefix = _color_name(color_list[0])
                 elif len(color_list) == 2:
-                    name_prefix = self._get_guild_name(color_list)
+                    name_prefix = _guild_name(tuple(color_list))
                 else:
                     continue  # Skip 3+ color combinations for now
                 
@@ -77,140 +343,112 @@ class ThemeExtractor:
         
         return valid_combinations
     
-    def _parse_colors(self, colors_str: str) -> List[str]:
-        """Parse color string into list of colors."""
-        if not colors_str or pd.isna(colors_str) or colors_str == '':
-            return []
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _parse_colors(cls, colors_str: str) -> Tuple[str, ...]:
+        """Parse color string into a tuple of colors (memoized: there are few distinct strings)."""
+        if not isinstance(colors_str, str):
+            return ()
+        colors_str = colors_str.strip().upper()
+        
+        # Plain color letters, like "W" for white or "WU" for white-blue
+        if cls._PLAIN_COLORS_RE.fullmatch(colors_str):
+            return tuple(colors_str)
+        
+        # Bracket/comma separated format like ['W', 'U'] or "W,U", otherwise space separated
+        cleaned = colors_str.strip('[]').replace("'", "").replace('"', '')
+        tokens = cleaned.split(',') if ',' in cleaned else cleaned.split()
+        return tuple(token.strip() for token in tokens if token.strip() in _COLOR_LETTERS)
+    
+    def _analyze_combo(self, color_filter: List[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Analyze tribal, keyword and CMC themes for one color combination from precomputed counts."""
+        tribal_counts, category_counts, cmc_counts = self._combo_counts(color_filter)
+        
+        # Skip analyses whose threshold exceeds the number of cards in the combination
+        card_total = self._combo_card_total(color_filter)
+        return (self._analyze_tribal_themes(color_filter, tribal_counts) if card_total >= _MIN_TRIBAL_CARDS else [],
+                self._analyze_keyword_themes(color_filter, category_counts) if card_total >= _MIN_KEYWORD_CARDS else [],
+                self._analyze_cmc_themes(color_filter, cmc_counts) if card_total >= min(_MIN_CHEAP_CARDS, _MIN_EXPENSIVE_CARDS) else [])
+    
+    def _combo_card_total(self, color_filter: List[str]) -> int:
+        """Number of cards matching the color filter (all cards if empty)."""
+        return int(self._key_counts(self._color_key_totals, color_filter))
+    
+    def _combo_counts(self, color_filter: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per tribal type, per keyword category and (cheap, expensive) card counts for the color filter."""
+        return (self._key_counts(self._tribal_counts_by_key, color_filter),
+                self._key_counts(self._category_counts_by_key, color_filter),
+                self._key_counts(self._cmc_counts_by_key, color_filter))
+    
+    def _key_counts(self, counts_by_key: np.ndarray, color_filter: List[str]) -> np.ndarray:
+        """Row of a per-color-key count table for the color filter (column totals if empty)."""
+        if not color_filter:
+            return counts_by_key.sum(axis=0)
         
-        # Handle different color string formats
-        if isinstance(colors_str, str):
-            colors_str = str(colors_str).strip()
-            
-            # If it's a single color character (W, U, B, R, G)
-            if len(colors_str) == 1 and colors_str.upper() in ['W', 'U', 'B', 'R', 'G']:
-                return [colors_str.upper()]
-            
-            # If it's multiple characters (like "WU" for white-blue)
-            if len(colors_str) <= 5 and all(c.upper() in 'WUBRG' for c in colors_str):
-                return list(colors_str.upper())
-            
-            # Handle bracket/comma separated format like ['W', 'U'] or "W,U"
-            cleaned = colors_str.strip('[]').replace("'", "").replace('"', '')
-            if ',' in cleaned:
-                colors = [c.strip().upper() for c in cleaned.split(',') if c.strip()]
-                return [c for c in colors if c in ['W', 'U', 'B', 'R', 'G']]
-            
-            # Handle space separated
-            if ' ' in cleaned:
-                colors = [c.strip().upper() for c in cleaned.split() if c.strip()]
-                return [c for c in colors if c in ['W', 'U', 'B', 'R', 'G']]
-        
-        return []
-    
-    def _get_color_name(self, color: str) -> str:
-        """Get full color name from abbreviation."""
-        color_map = {
-            'W': 'White', 'U': 'Blue', 'B': 'Black', 
-            'R': 'Red', 'G': 'Green'
-        }
-        return color_map.get(color.upper(), color.title())
-    
-    def _get_guild_name(self, colors: List[str]) -> str:
-        """Get guild name for two-color combination."""
-        guild_map = {
-            ('B', 'G'): 'Golgari', ('G', 'W'): 'Selesnya', ('R', 'W'): 'Boros',
-            ('B', 'R'): 'Rakdos', ('G', 'U'): 'Simic', ('R', 'U'): 'Izzet',
-            ('B', 'W'): 'Orzhov', ('G', 'R'): 'Gruul', ('U', 'W'): 'Azorius',
-            ('B', 'U'): 'Dimir'
-        }
-        color_key = tuple(sorted([c.upper() for c in colors]))
-        return guild_map.get(color_key, f"{self._get_color_name(colors[0])}-{self._get_color_name(colors[1])}")
+        key_index = self._color_key_index.get(self._color_key_of(color_filter))
+        if key_index is None:
+            return np.zeros(counts_by_key.shape[1:], dtype=counts_by_key.dtype)
+        return counts_by_key[key_index]
     
-    def _analyze_tribal_themes(self, color_filter: List[str]) -> List[Dict[str, Any]]:
+    def _analyze_tribal_themes(self, color_filter: List[str], counts: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
         """Analyze potential tribal themes for given colors."""
-        filtered_df = self._filter_by_colors(color_filter)
         tribal_themes = []
         
-        # Count creature types
-        type_counts = Counter()
-        for types_set in filtered_df['creature_types']:
-            for creature_type in types_set:
-                if creature_type in TRIBAL_TYPES:
-                    type_counts[creature_type] += 1
+        # Count creature types; only types at the threshold need their first appearance in the
+        # filtered cards, which breaks ties between equal counts
+        if counts is None:
+            counts = np.count_nonzero(self._tribal_mask[self._row_mask(color_filter)], axis=0)
+        qualifying = np.flatnonzero(counts >= _MIN_TRIBAL_CARDS)
+        if len(qualifying) == 0:
+            return tribal_themes
+        
+        row_mask = self._row_mask(color_filter)
+        creature_types = self.oracle_df['creature_types'].to_numpy()
+        type_counts = []
+        for i in qualifying:
+            first_row = int(np.argmax(row_mask & self._tribal_mask[:, i]))
+            first_seen = (first_row, list(creature_types[first_row]).index(_TRIBAL_TYPE_LIST[i]))
+            type_counts.append((first_seen, _TRIBAL_TYPE_LIST[i], int(counts[i])))
+        type_counts.sort(key=lambda entry: (-entry[2], entry[0]))
         
         # Generate themes for types with enough cards
-        for creature_type, count in type_counts.most_common():
-            if count >= 8:  # Minimum threshold for tribal theme
-                theme = self._create_tribal_theme(creature_type, color_filter, count)
-                if theme:
-                    tribal_themes.append(theme)
+        for _, creature_type, count in type_counts:
+            theme = self._create_tribal_theme(creature_type, color_filter, count)
+            if theme:
+                tribal_themes.append(theme)
         
         return tribal_themes
     
-    def _analyze_keyword_themes(self, color_filter: List[str]) -> List[Dict[str, Any]]:
+    def _analyze_keyword_themes(self, color_filter: List[str], category_counts: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
         """Analyze themes based on keyword density."""
-        filtered_df = self._filter_by_colors(color_filter)
         keyword_themes = []
         
-        # Analyze different keyword categories
-        theme_categories = [
-            ('Equipment', EQUIPMENT_KEYWORDS, Archetype.EQUIPMENT, create_equipment_scorer),
-            ('Aggro', AGGRESSIVE_KEYWORDS, Archetype.AGGRO, create_aggressive_scorer),
-            ('Control', CONTROL_KEYWORDS, Archetype.CONTROL, create_control_scorer),
-            ('Ramp', RAMP_KEYWORDS, Archetype.RAMP, create_default_scorer),
-            ('Tempo', TEMPO_KEYWORDS, Archetype.TEMPO, create_aggressive_scorer),
-            ('Combo', COMBO_KEYWORDS, Archetype.COMBO, create_default_scorer),
-            ('Voltron', VOLTRON_KEYWORDS, Archetype.VOLTRON, create_equipment_scorer),
-            ('Aristocrats', ARISTOCRATS_KEYWORDS, Archetype.ARISTOCRATS, create_default_scorer),
-            ('Graveyard', GRAVEYARD_KEYWORDS, Archetype.GRAVEYARD, create_default_scorer),
-            ('Burn', BURN_KEYWORDS, Archetype.BURN, create_aggressive_scorer),
-            ('Spellslinger', SPELLSLINGER_KEYWORDS, Archetype.SPELLSLINGER, create_default_scorer),
-            ('Lifegain', LIFEGAIN_KEYWORDS, Archetype.LIFEGAIN, create_default_scorer),
-            ('Tokens', TOKEN_KEYWORDS, Archetype.TOKENS, create_default_scorer),
-            ('Enchantments', ENCHANTMENTS_KEYWORDS, Archetype.ENCHANTMENTS, create_default_scorer),
-            ('Counters', COUNTERS_KEYWORDS, Archetype.COUNTERS, create_default_scorer),
-            ('Mill', MILL_KEYWORDS, Archetype.MILL, create_default_scorer),
-            ('Landfall', LANDFALL_KEYWORDS, Archetype.LANDFALL, create_default_scorer),
-            ('Cycling', CYCLING_KEYWORDS, Archetype.CYCLING, create_default_scorer),
-            ('Madness', MADNESS_KEYWORDS, Archetype.MADNESS, create_default_scorer),
-            ('Midrange', MIDRANGE_KEYWORDS, Archetype.MIDRANGE, create_default_scorer),
-            ('Vehicles', VEHICLES_KEYWORDS, Archetype.VEHICLES, create_default_scorer),
-            ('Planeswalkers', PLANESWALKERS_KEYWORDS, Archetype.PLANESWALKERS, create_default_scorer),
-            ('Historic', HISTORIC_KEYWORDS, Archetype.HISTORIC, create_default_scorer),
-            ('Kicker', KICKER_KEYWORDS, Archetype.KICKER, create_default_scorer),
-            ('Multicolor', MULTICOLOR_KEYWORDS, Archetype.MULTICOLOR, create_default_scorer),
-            ('Blink', BLINK_KEYWORDS, Archetype.BLINK, create_default_scorer),
-            ('Sacrifice', SACRIFICE_KEYWORDS, Archetype.SACRIFICE, create_default_scorer),
-            ('Storm', STORM_KEYWORDS, Archetype.STORM, create_default_scorer),
-            ('Infect', INFECT_KEYWORDS, Archetype.INFECT, create_aggressive_scorer),
-            ('Reanimator', REANIMATOR_KEYWORDS, Archetype.REANIMATOR, create_default_scorer),
-            ('Slivers', SLIVERS_KEYWORDS, Archetype.SLIVERS, create_tribal_scorer),
-            ('Eldrazi', ELDRAZI_KEYWORDS, Archetype.ELDRAZI, create_default_scorer),
-            ('Energy', ENERGY_KEYWORDS, Archetype.ENERGY, create_default_scorer),
-            ('Devotion', DEVOTION_KEYWORDS, Archetype.DEVOTION, create_default_scorer),
-            ('Affinity', AFFINITY_KEYWORDS, Archetype.AFFINITY, create_artifact_scorer),
-        ]
-        
-        for theme_name, keywords, archetype, scorer in theme_categories:
-            keyword_cards = self._count_keyword_cards(filtered_df, keywords)
-            if keyword_cards >= 10:  # Minimum threshold
-                theme = self._create_keyword_theme(
-                    theme_name, color_filter, keywords, archetype, scorer, keyword_cards
-                )
-                keyword_themes.append(theme)
+        # Count matching cards for every category at once: AND each category row with the
+        # color mask and popcount along the cards axis
+        if category_counts is None:
+            category_counts = np.bitwise_count(self._category_masks & self._packed_color_mask(color_filter)).sum(axis=1)
+        
+        # Threshold every category in one comparison and only visit the ones that pass
+        for i in np.flatnonzero(category_counts >= _MIN_KEYWORD_CARDS).tolist():
+            theme_name, keywords, archetype, scorer = _KEYWORD_THEME_CATEGORIES[i]
+            theme = self._create_keyword_theme(
+                theme_name, color_filter, keywords, archetype, scorer, int(category_counts[i])
+            )
+            keyword_themes.append(theme)
         
         return keyword_themes
     
-    def _analyze_cmc_themes(self, color_filter: List[str]) -> List[Dict[str, Any]]:
+    def _analyze_cmc_themes(self, color_filter: List[str], cmc_counts: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
         """Analyze themes based on mana cost distribution."""
-        filtered_df = self._filter_by_colors(color_filter)
+        if cmc_counts is None:
+            cmc_counts = self._key_counts(self._cmc_counts_by_key, color_filter)
+        cheap_cards, expensive_cards = cmc_counts.tolist()
         cmc_themes = []
         
         # Aggressive low-cost theme
-        cheap_cards = len(filtered_df[filtered_df['is_cheap']])
-        if cheap_cards >= 15:
+        if cheap_cards >= _MIN_CHEAP_CARDS:
             theme = {
-                'colors': [self._color_to_enum_value(c) for c in color_filter],
+                'colors': [_color_enum_value(c) for c in color_filter],
                 'strategy': 'Fast aggressive deck with efficient low-cost threats',
                 'keywords': ['cheap', 'aggressive', 'efficient', 'low cost', 'fast', 'early'],
                 'archetype': Archetype.AGGRO,
@@ -220,10 +458,9 @@ class ThemeExtractor:
             cmc_themes.append(theme)
         
         # Big mana theme
-        expensive_cards = len(filtered_df[filtered_df['is_expensive']])
-        if expensive_cards >= 8:
+        if expensive_cards >= _MIN_EXPENSIVE_CARDS:
             theme = {
-                'colors': [self._color_to_enum_value(c) for c in color_filter],
+                'colors': [_color_enum_value(c) for c in color_filter],
                 'strategy': 'Ramp into expensive threats and powerful late-game spells',
                 'keywords': ['expensive', 'big', 'large', 'ramp', 'late game', 'powerful'],
                 'archetype': Archetype.RAMP,
@@ -239,51 +476,115 @@ class ThemeExtractor:
         if not color_filter:
             return self.oracle_df
         
-        def matches_colors(card_colors_str):
-            card_colors = self._parse_colors(card_colors_str)
-            if not card_colors:
-                return len(color_filter) == 0
-            
-            card_colors_set = set(c.upper() for c in card_colors)
-            filter_colors_set = set(c.upper() for c in color_filter)
-            
-            # Card must contain all filter colors and no others
-            return card_colors_set == filter_colors_set
-        
-        return self.oracle_df[self.oracle_df['Color'].apply(matches_colors)]
+        # Each distinct color set is only filtered once per extractor
+        filter_colors = frozenset(c.upper() for c in color_filter)
+        if filter_colors not in self._color_filter_cache:
+            self._color_filter_cache[filter_colors] = self.oracle_df[self._color_mask(filter_colors)]
+        return self._color_filter_cache[filter_colors]
+    
+    def _row_mask(self, color_filter: List[str]) -> np.ndarray:
+        """Boolean row mask of cards matching the color filter (all cards if empty)."""
+        if not color_filter:
+            return np.ones(len(self.oracle_df), dtype=bool)
+        return self._color_mask(frozenset(c.upper() for c in color_filter))
+    
+    def _color_mask(self, filter_colors: FrozenSet[str]) -> np.ndarray:
+        """Boolean row mask of cards whose colors exactly match the filter colors."""
+        key_index = self._color_key_index.get(''.join(sorted(filter_colors)))
+        if not filter_colors or key_index is None:
+            return np.zeros(len(self.oracle_df), dtype=bool)
+        
+        # Card must contain all filter colors and no others: the precomputed mask of its color key
+        return self._color_key_rows[key_index]
     
-    def _count_keyword_cards(self, df: pd.DataFrame, keywords: Set[str]) -> int:
-        """Count cards that contain any of the given keywords."""
-        count = 0
-        for _, card in df.iterrows():
-            text = f"{card['Oracle Text']} {card['Type']}".lower()
-            if any(keyword in text for keyword in keywords):
-                count += 1
-        return count
+    @staticmethod
+    def _color_key_of(color_filter: List[str]) -> str:
+        """Canonical color key (sorted, upper-case, e.g. 'BG') of a color filter."""
+        return ''.join(sorted({c.upper() for c in color_filter}))
+    
+    def _count_keyword_cards(self, color_filter: List[str], keywords: Set[str]) -> int:
+        """Count cards of the given colors that contain any of the given keywords."""
+        # Nothing to match: skip building (and scanning for) the keyword set's mask
+        if not keywords or self._combo_card_total(color_filter) == 0:
+            return 0
+        matches = self._keywords_mask(keywords) & self._packed_color_mask(color_filter)
+        return int(np.bitwise_count(matches).sum())
+    
+    def _packed_color_mask(self, color_filter: List[str]) -> np.ndarray:
+        """Bit-packed mask of cards matching the color filter (all cards if empty)."""
+        filter_colors = frozenset(c.upper() for c in color_filter)
+        if filter_colors not in self._packed_color_masks:
+            self._packed_color_masks[filter_colors] = np.packbits(self._row_mask(color_filter))
+        return self._packed_color_masks[filter_colors]
+    
+    def _keywords_mask(self, keywords: Set[str]) -> np.ndarray:
+        """Bit-packed mask over all cards matching any of the given keywords."""
+        # Themes of the same kind share keyword sets across colors, so combine each set once
+        keywords = frozenset(keywords)
+        if keywords in self._keyword_set_masks:
+            return self._keyword_set_masks[keywords]
+        
+        # Literal keyword masks come from the single-pass hit matrix; OR them in one reduction.
+        # Multi-word literals outside the keyword tables share one trie-pattern scan
+        regex_keywords = frozenset(k for k in keywords if is_regex_keyword(k))
+        unscanned_phrases = frozenset(
+            k for k in keywords
+            if k not in regex_keywords and k not in self._keyword_masks and any(c.isspace() for c in k)
+        )
+        literal_masks = [self._keyword_mask(k) for k in keywords
+                         if k not in regex_keywords and k not in unscanned_phrases]
+        if len(unscanned_phrases) > 1:
+            literal_masks.append(np.packbits(self.oracle_df['search_text'].str.contains(
+                re.compile(trie_regex(unscanned_phrases)), regex=True
+            ).to_numpy(dtype=bool)))
+        else:
+            literal_masks.extend(self._keyword_mask(k) for k in unscanned_phrases)
+        if literal_masks:
+            mask = np.bitwise_or.reduce(literal_masks, axis=0)
+        else:
+            mask = np.zeros((len(self.oracle_df) + 7) // 8, dtype=np.uint8)
+        if regex_keywords:
+            np.bitwise_or(mask, self._regex_union_mask(regex_keywords), out=mask)
+        mask.flags.writeable = False  # Shared by every caller with the same keyword set
+        self._keyword_set_masks[keywords] = mask
+        return mask
+    
+    def _regex_union_mask(self, patterns: FrozenSet[str]) -> np.ndarray:
+        """Bit-packed mask over all cards matching any of the regex keywords, in one combined scan."""
+        if patterns not in self._regex_union_masks:
+            union = compile_keyword_union(patterns)
+            self._regex_union_masks[patterns] = np.packbits(
+                self.oracle_df['search_text'].str.contains(union, regex=True).to_numpy(dtype=bool)
+            )
+        return self._regex_union_masks[patterns]
+    
+    def _keyword_mask(self, keyword: str) -> np.ndarray:
+        """Bit-packed mask over all cards whose search text contains the keyword."""
+        # Inverted index: each keyword scans the card pool once per extractor
+        if keyword not in self._keyword_masks:
+            if is_regex_keyword(keyword):
+                mask = self.oracle_df['search_text'].str.contains(keyword, regex=True).to_numpy(dtype=bool)
+            elif keyword and not any(c.isspace() for c in keyword):
+                # A single-word keyword can only occur inside one token, so scan the
+                # much smaller vocabulary and map matching tokens back to their rows
+                token_hits = np.strings.find(self._token_vocab, keyword) >= 0
+                mask = np.zeros(len(self.oracle_df), dtype=bool)
+                mask[self._token_rows[token_hits[self._token_codes]]] = True
+            else:
+                mask = self.oracle_df['search_text'].str.contains(keyword, regex=False).to_numpy(dtype=bool)
+            self._keyword_masks[keyword] = np.packbits(mask)
+        return self._keyword_masks[keyword]
     
     def _create_tribal_theme(self, creature_type: str, colors: List[str], card_count: int) -> Optional[Dict[str, Any]]:
         """Create a tribal theme dictionary."""
         color_prefix = self._get_color_prefix(colors)
         
-        # Generate tribal-specific keywords
+        # Generate tribal-specific keywords, plus any type-specific ones
         base_keywords = ['tribal', creature_type, 'creature', 'enters', 'lord', 'gets +']
-        
-        # Add type-specific keywords
-        type_keywords = {
-            'soldier': ['anthem', 'pump', 'attack', 'vigilance', 'first strike'],
-            'wizard': ['instant', 'sorcery', 'prowess', 'draw', 'counter'],
-            'goblin': ['haste', 'sacrifice', 'token', 'aggressive'],
-            'elf': ['mana', 'tap', 'forest', 'add', 'produces'],
-            'zombie': ['graveyard', 'return', 'sacrifice', 'dies'],
-            'angel': ['flying', 'vigilance', 'lifelink', 'protection'],
-            'dragon': ['flying', 'expensive', 'power', 'trample', 'haste'],
-            'beast': ['power', 'toughness', 'trample', 'fight'],
-        }
-        
-        keywords = base_keywords + type_keywords.get(creature_type, [])
+        keywords = base_keywords + list(_TRIBAL_TYPE_KEYWORDS.get(creature_type, ()))
         
         return {
-            'colors': [self._color_to_enum_value(c) for c in colors],
+            'colors': [_color_enum_value(c) for c in colors],
             'strategy': f'{creature_type.title()} tribal with synergistic effects and creature bonuses',
             'keywords': keywords,
             'archetype': Archetype.TRIBAL,
@@ -295,7 +596,7 @@ class ThemeExtractor:
                             archetype: Archetype, scorer, card_count: int) -> Dict[str, Any]:
         """Create a keyword-based theme dictionary."""
         return {
-            'colors': [self._color_to_enum_value(c) for c in colors],
+            'colors': [_color_enum_value(c) for c in colors],
             'strategy': f'{theme_name} strategy with {archetype.value.lower()} gameplan',
             'keywords': list(keywords),
             'archetype': archetype,
@@ -306,23 +607,12 @@ class ThemeExtractor:
     def _get_color_prefix(self, colors: List[str]) -> str:
         """Get color prefix for theme naming."""
         if len(colors) == 1:
-            return self._get_color_name(colors[0])
+            return _color_name(colors[0])
         elif len(colors) == 2:
-            return self._get_guild_name(colors)
+            return _guild_name(tuple(colors))
         else:
             return "Multicolor"
     
-    def _color_to_enum_value(self, color: str) -> str:
-        """Convert color string to MagicColor enum value."""
-        color_map = {
-            'W': MagicColor.WHITE.value,
-            'U': MagicColor.BLUE.value,
-            'B': MagicColor.BLACK.value,
-            'R': MagicColor.RED.value,
-            'G': MagicColor.GREEN.value
-        }
-        return color_map.get(color.upper(), color.upper())
-    
     def _extract_guild_themes(self) -> Dict[str, Dict[str, Any]]:
         """Extract guild themes with lower thresholds specifically for 2-color combinations."""
         guild_themes = {}
@@ -336,51 +626,14 @@ class ThemeExtractor:
             card_count = len(filtered_df)
             
             if card_count >= 3:  # Lower threshold for guilds
-                # Determine best archetype based on guild identity
-                guild_archetypes = {
-                    'Azorius': Archetype.CONTROL,      # U/W - Control
-                    'Dimir': Archetype.CONTROL,        # U/B - Control/Mill  
-                    'Rakdos': Archetype.AGGRO,         # B/R - Aggro/Burn
-                    'Gruul': Archetype.AGGRO,          # R/G - Aggro/Ramp
-                    'Selesnya': Archetype.MIDRANGE,    # G/W - Tokens/Midrange
-                    'Orzhov': Archetype.MIDRANGE,      # B/W - Lifegain/Midrange
-                    'Izzet': Archetype.TEMPO,          # U/R - Spells/Tempo
-                    'Golgari': Archetype.MIDRANGE,     # B/G - Graveyard/Midrange
-                    'Boros': Archetype.AGGRO,         # R/W - Aggro/Equipment
-                    'Simic': Archetype.RAMP            # G/U - Ramp/Value
-                }
-                
-                archetype = guild_archetypes.get(guild_name, Archetype.MIDRANGE)
-                
-                # Create guild-specific keywords based on the guild identity
-                guild_keywords = {
-                    'Azorius': ['flying', 'counter', 'detain', 'control', 'flying creatures'],
-                    'Dimir': ['mill', 'graveyard', 'card draw', 'control', 'surveillance'], 
-                    'Rakdos': ['haste', 'aggressive', 'damage', 'sacrifice', 'unleash'],
-                    'Gruul': ['trample', 'haste', 'power matters', 'bloodrush', 'ramp'],
-                    'Selesnya': ['tokens', 'populate', 'convoke', 'creatures matter', 'anthem'],
-                    'Orzhov': ['lifegain', 'extort', 'removal', 'aristocrats', 'afterlife'],
-                    'Izzet': ['instant', 'sorcery', 'spells matter', 'card draw', 'overload'],
-                    'Golgari': ['graveyard', 'scavenge', 'dredge', 'sacrifice', 'undergrowth'],
-                    'Boros': ['equipment', 'battalion', 'mentor', 'aggressive', 'combat'],
-                    'Simic': ['card draw', 'ramp', 'evolve', 'adapt', '+1/+1 counters']
-                }
-                
-                keywords = guild_keywords.get(guild_name, ['multicolor', 'synergy'])
-                
-                # Get appropriate scorer for archetype
-                scorer_map = {
-                    Archetype.AGGRO: create_aggressive_scorer,
-                    Archetype.CONTROL: create_control_scorer,
-                    Archetype.MIDRANGE: create_default_scorer,
-                    Archetype.TEMPO: create_aggressive_scorer,
-                    Archetype.RAMP: create_default_scorer
-                }
-                scorer = scorer_map.get(archetype, create_default_scorer)
+                # Archetype, keywords and scorer follow from the guild identity
+                archetype = _GUILD_ARCHETYPES.get(guild_name, Archetype.MIDRANGE)
+                keywords = list(_GUILD_KEYWORDS.get(guild_name, ('multicolor', 'synergy')))
+                scorer = _GUILD_SCORERS.get(archetype, create_default_scorer)
                 
                 # Create the theme
                 theme = {
-                    'colors': [self._color_to_enum_value(c) for c in colors],
+                    'colors': [_color_enum_value(c) for c in colors],
                     'strategy': f'{guild_name} guild synergies with {archetype.value.lower()} gameplan',
                     'keywords': keywords,
                     'archetype': archetype,
@@ -411,15 +664,16 @@ class ThemeExtractor:
         color_combinations = self._get_color_combinations(min_cards=min_combination_cards)
         
         for colors, color_prefix in color_combinations:
+            # Tribal, keyword and CMC themes all share one color row mask
+            tribal_themes, keyword_themes, cmc_themes = self._analyze_combo(colors)
+            
             # Analyze tribal themes
-            tribal_themes = self._analyze_tribal_themes(colors)
             for i, theme in enumerate(tribal_themes):
                 creature_type = [k for k in theme['keywords'] if k in TRIBAL_TYPES][0]
                 theme_name = f"{color_prefix} {creature_type.title()}s"
                 all_themes[theme_name] = theme
             
             # Analyze keyword themes
-            keyword_themes = self._analyze_keyword_themes(colors)
             for i, theme in enumerate(keyword_themes):
                 # Use enum value directly for theme naming
                 archetype_name = theme['archetype'].value
@@ -429,7 +683,6 @@ class ThemeExtractor:
                     all_themes[theme_name] = theme
             
             # Analyze CMC-based themes
-            cmc_themes = self._analyze_cmc_themes(colors)
             for i, theme in enumerate(cmc_themes):
                 archetype_name = 'Fast' if theme['archetype'] == Archetype.AGGRO else 'Big'
                 theme_name = f"{color_prefix} {archetype_name}"
@@ -455,7 +708,7 @@ class ThemeExtractor:
         for archetype, theme_list in by_archetype.items():
             summary.append(f"## {archetype.value} Themes ({len(theme_list)})")
             for name, theme in sorted(theme_list):
-                colors = " + ".join([c.split('.')[-1] for c in theme['colors']])
+                colors = " + ".join(_short_colors(tuple(theme['colors'])))
                 summary.append(f"- **{name}** ({colors}): {theme['strategy']}")
             summary.append("")
         
@@ -481,6 +734,10 @@ class ThemeExtractor:
         """
         print(f"🎯 Selecting optimal themes: {mono_count} mono + {dual_count} dual = {mono_count + dual_count} total")
         
+        # Buildability only depends on the theme itself, so it is memoized per selection run
+        self._buildability_cache.clear()
+        self._profile_cache.clear()
+        
         # Separate mono and dual color themes
         mono_themes = {name: theme for name, theme in themes.items() 
                       if len(theme['colors']) == 1}
@@ -522,14 +779,15 @@ class ThemeExtractor:
             return themes
         
         # Score each theme
-        scored_themes = []
-        for name, theme in themes.items():
-            score = self._calculate_theme_score(name, theme, themes, prioritize_buildability, diversity_weight)
-            scored_themes.append((name, theme, score))
+        candidates = list(themes.items())
+        pool_stats = self._theme_pool_stats(themes)
+        weights = _score_weights(prioritize_buildability, diversity_weight)
+        scores = self._score_candidates(candidates, pool_stats, weights)
+        scored_themes = [(name, theme, score) for (name, theme), score in zip(candidates, scores)]
         
-        # Sort by score (highest first) and select top N
-        scored_themes.sort(key=lambda x: x[2], reverse=True)
-        selected = {name: theme for name, theme, score in scored_themes[:count]}
+        # Select top N by score (highest first) without sorting the whole list
+        top_themes = heapq.nlargest(count, scored_themes, key=itemgetter(2))
+        selected = {name: theme for name, theme, score in top_themes}
         
         print(f"  🎯 Selected top {len(selected)} {theme_type} themes")
         
@@ -546,12 +804,7 @@ class ThemeExtractor:
         # Group themes by color
         themes_by_color = defaultdict(list)
         for name, theme in mono_themes.items():
-            color = theme['colors'][0]  # Single color for mono themes
-            # Normalize color notation (handle both 'W' and 'WHITE' formats)
-            if '.' in color:
-                color_key = color.split('.')[-1]  # Extract 'W' from 'MagicColor.WHITE'
-            else:
-                color_key = color
+            color_key = _short_colors(tuple(theme['colors']))[0]  # Single color for mono themes
             themes_by_color[color_key].append((name, theme))
         
         # Calculate themes per color (as evenly as possible)
@@ -564,6 +817,10 @@ class ThemeExtractor:
         selected = {}
         color_distribution = {}
         
+        # The candidate pool and weights are fixed for the whole distribution, so compute them once
+        pool_stats = self._theme_pool_stats(mono_themes)
+        weights = _score_weights(prioritize_buildability, diversity_weight)
+        
         # First pass: select base number of themes per color
         for color in colors:
             if color not in themes_by_color:
@@ -575,17 +832,14 @@ class ThemeExtractor:
             target_count = themes_per_color
             
             # Score and select best themes for this color
-            scored_themes = []
-            for name, theme in available:
-                score = self._calculate_theme_score(name, theme, mono_themes, prioritize_buildability, diversity_weight)
-                scored_themes.append((name, theme, score))
+            scores = self._score_candidates(available, pool_stats, weights)
+            scored_themes = [(name, theme, score) for (name, theme), score in zip(available, scores)]
             
-            # Sort by score and select top themes
-            scored_themes.sort(key=lambda x: x[2], reverse=True)
-            selected_count = min(target_count, len(scored_themes))
+            # Select top themes by score
+            top_themes = heapq.nlargest(target_count, scored_themes, key=itemgetter(2))
+            selected_count = len(top_themes)
             
-            for i in range(selected_count):
-                name, theme, score = scored_themes[i]
+            for name, theme, score in top_themes:
                 selected[name] = theme
             
             color_distribution[color] = selected_count
@@ -607,16 +861,11 @@ class ThemeExtractor:
                 
                 if current_selected < available_count:
                     # Select next best theme for this color
-                    available = themes_by_color[color]
-                    scored_themes = []
-                    for name, theme in available:
-                        if name not in selected:  # Not already selected
-                            score = self._calculate_theme_score(name, theme, mono_themes, prioritize_buildability, diversity_weight)
-                            scored_themes.append((name, theme, score))
+                    candidates = [(name, theme) for name, theme in themes_by_color[color]
+                                  if name not in selected]  # Not already selected
                     
-                    if scored_themes:
-                        scored_themes.sort(key=lambda x: x[2], reverse=True)
-                        name, theme, score = scored_themes[0]
+                    if candidates:
+                        name, theme = self._pick_best_candidate(candidates, pool_stats, weights)
                         selected[name] = theme
                         color_distribution[color] += 1
                         remaining_extra -= 1
@@ -633,58 +882,112 @@ class ThemeExtractor:
         
         return selected
     
-    def _calculate_theme_score(self, theme_name: str, theme: Dict[str, Any], 
-                             all_themes: Dict[str, Dict[str, Any]],
-                             prioritize_buildability: bool, diversity_weight: float) -> float:
-        """Calculate a score for a theme based on buildability and diversity."""
-        score = 0.0
-        
-        # 1. Buildability Score (0-1)
-        buildability = self._assess_buildability(theme_name, theme)
-        score += buildability * (0.7 if prioritize_buildability else 0.5)
-        
-        # 2. Diversity Score (0-1) 
-        diversity = self._assess_diversity(theme, all_themes)
-        score += diversity * diversity_weight
-        
-        # 3. Archetype Balance Score (0-1)
-        balance = self._assess_archetype_rarity(theme, all_themes)
-        score += balance * (1.0 - diversity_weight - (0.7 if prioritize_buildability else 0.5))
+    def _theme_pool_stats(self, all_themes: Dict[str, Dict[str, Any]]) -> Tuple[Counter, Counter, int]:
+        """Count archetypes and color sets across the candidate pool."""
+        # Pool-relative scores from a previous pool no longer apply
+        self._score_cache.clear()
+        profiles = [self._theme_profile(name, theme) for name, theme in all_themes.items()]
+        archetype_counts = Counter(p.archetype for p in profiles)
+        color_counts = Counter(p.color_set for p in profiles)
+        return archetype_counts, color_counts, len(all_themes)
+    
+    def _theme_profile(self, theme_name: str, theme: Dict[str, Any]) -> _ThemeProfile:
+        """Get the scoring profile for a theme, built once per selection run."""
+        profile = self._profile_cache.get(theme_name)
+        if profile is None:
+            profile = self._profile_cache[theme_name] = _ThemeProfile.from_theme(theme)
+        return profile
+    
+    def _score_candidates(self, candidates: List[Tuple[str, Dict[str, Any]]],
+                          pool_stats: Tuple[Counter, Counter, int],
+                          weights: Tuple[float, float, float]) -> np.ndarray:
+        """Score candidate themes based on buildability and diversity."""
+        count = len(candidates)
+        buildability = np.empty(count)
+        diversity = np.empty(count)
+        balance = np.empty(count)
+        
+        # Extract the three feature scores (0-1) for every candidate first
+        for i, (name, theme) in enumerate(candidates):
+            profile = self._theme_profile(name, theme)
+            buildability[i] = self._cached_buildability(name, profile)
+            diversity[i], balance[i] = self._cached_pool_scores(name, profile, pool_stats)
+        
+        # Then combine them into weighted scores in a single vectorized pass
+        return _score_batch(buildability, diversity, balance, weights)
+    
+    def _pick_best_candidate(self, candidates: List[Tuple[str, Dict[str, Any]]],
+                             pool_stats: Tuple[Counter, Counter, int],
+                             weights: Tuple[float, float, float]) -> Tuple[str, Dict[str, Any]]:
+        """Pick the highest scoring candidate, skipping buildability checks that cannot win."""
+        w_build, w_div, w_balance = weights
+        
+        profiles = [self._theme_profile(name, theme) for name, theme in candidates]
+        diversity, balance = zip(*(self._cached_pool_scores(name, profile, pool_stats)
+                                   for (name, _), profile in zip(candidates, profiles)))
+        
+        # Buildability is at most 1.0, which bounds the score each candidate can still reach
+        upper_bounds = np.array([d * w_div + b * w_balance for d, b in zip(diversity, balance)]) + w_build + 1e-9
+        
+        # Branch and bound: visit the most promising candidates first and stop once none can win
+        best_index, best_score = -1, -np.inf
+        for i in np.argsort(-upper_bounds, kind='stable'):
+            if upper_bounds[i] < best_score:
+                break
+            score = (self._cached_buildability(candidates[i][0], profiles[i]) * w_build
+                     + diversity[i] * w_div + balance[i] * w_balance)
+            # Ties go to the earliest candidate, like a full sort would
+            if score > best_score or (score == best_score and i < best_index):
+                best_index, best_score = i, score
         
-        return score
+        return candidates[best_index]
     
-    def _assess_buildability(self, theme_name: str, theme: Dict[str, Any]) -> float:
+    def _cached_pool_scores(self, theme_name: str, profile: _ThemeProfile,
+                            pool_stats: Tuple[Counter, Counter, int]) -> Tuple[float, float]:
+        """Get (diversity, balance) for a theme, computed once per candidate pool."""
+        # Both scores only depend on the fixed pool counts, never on what has been picked,
+        # so repeated extra-theme rounds reuse them without any invalidation
+        scores = self._score_cache.get(theme_name)
+        if scores is None:
+            archetype_counts, color_counts, total_themes = pool_stats
+            scores = self._score_cache[theme_name] = (
+                self._assess_diversity(profile, archetype_counts, color_counts),
+                self._assess_archetype_rarity(profile, archetype_counts, total_themes),
+            )
+        return scores
+    
+    def _cached_buildability(self, theme_name: str, profile: _ThemeProfile) -> float:
+        """Get buildability for a theme, memoized for the current selection run."""
+        if theme_name not in self._buildability_cache:
+            self._buildability_cache[theme_name] = self._assess_buildability(theme_name, profile)
+        return self._buildability_cache[theme_name]
+    
+    def _assess_buildability(self, theme_name: str, profile: _ThemeProfile) -> float:
         """Assess how likely a theme is to build successfully into a complete deck."""
-        colors = theme['colors']
-        is_mono = len(colors) == 1
+        is_mono = len(profile.colors) == 1
         
         # Filter cards for this theme
-        filtered_df = self._filter_by_colors([c.split('.')[-1] for c in colors])
+        color_filter = list(profile.colors)
+        filtered_df = self._filter_by_colors(color_filter)
         available_cards = len(filtered_df)
         
         # Base score from card availability
         card_score = min(available_cards / 30.0, 1.0)  # Normalize to 30 cards as ideal
         
         # Keyword density bonus
-        keywords = set(theme.get('keywords', []))
-        keyword_matches = 0
-        for _, card in filtered_df.iterrows():
-            text = f"{card['Oracle Text']} {card['Type']}".lower()
-            if any(keyword in text for keyword in keywords):
-                keyword_matches += 1
+        keyword_matches = self._count_keyword_cards(color_filter, profile.keywords)
         
         keyword_score = min(keyword_matches / max(available_cards, 1), 0.5)
         
         # Archetype suitability
-        archetype = theme.get('archetype')
+        archetype = profile.archetype
         archetype_score = 0.8  # Default good score
         
         if archetype:
             # Bonus for archetypes that are easier to build
-            easy_archetypes = [Archetype.AGGRO, Archetype.MIDRANGE, Archetype.TRIBAL]
-            if archetype in easy_archetypes:
+            if archetype in _EASY_ARCHETYPES:
                 archetype_score = 1.0
-            elif archetype in [Archetype.CONTROL, Archetype.COMBO]:
+            elif archetype in _HARD_ARCHETYPES:
                 archetype_score = 0.6  # Harder to build well
         
         # Color availability bonus (mono-color themes easier to build)
@@ -695,44 +998,32 @@ class ThemeExtractor:
         
         return min(total_score, 1.0)
     
-    def _assess_diversity(self, theme: Dict[str, Any], all_themes: Dict[str, Dict[str, Any]]) -> float:
+    def _assess_diversity(self, profile: _ThemeProfile, archetype_counts: Counter,
+                          color_counts: Counter) -> float:
         """Assess how much diversity this theme adds to the overall selection."""
-        archetype = theme.get('archetype')
-        colors = theme['colors']
-        strategy = theme.get('strategy', '')
-        
-        # Count similar themes
-        similar_archetype_count = sum(1 for t in all_themes.values() 
-                                    if t.get('archetype') == archetype)
-        similar_color_count = sum(1 for t in all_themes.values() 
-                                if set(t['colors']) == set(colors))
+        # Look up similar theme counts precomputed for the whole pool
+        similar_archetype_count = archetype_counts[profile.archetype]
+        similar_color_count = color_counts[profile.color_set]
         
         # Diversity bonus for underrepresented archetypes/colors
         archetype_diversity = 1.0 / max(similar_archetype_count, 1)
         color_diversity = 1.0 / max(similar_color_count, 1)
         
-        # Strategy uniqueness (basic text analysis)
-        strategy_words = set(strategy.lower().split())
-        strategy_diversity = len(strategy_words) / max(len(strategy.split()), 1)
+        # Strategy uniqueness (basic text analysis, cached per strategy string)
+        strategy_diversity = _strategy_diversity(profile.strategy)
         
         diversity_score = (archetype_diversity * 0.5 + color_diversity * 0.3 + 
                          strategy_diversity * 0.2)
         
         return min(diversity_score, 1.0)
     
-    def _assess_archetype_rarity(self, theme: Dict[str, Any], 
-                               all_themes: Dict[str, Dict[str, Any]]) -> float:
+    def _assess_archetype_rarity(self, profile: _ThemeProfile, archetype_counts: Counter,
+                               total_themes: int) -> float:
         """Give bonus to archetypes that are underrepresented."""
-        archetype = theme.get('archetype')
-        
-        # Count archetype frequency
-        archetype_counts = defaultdict(int)
-        for t in all_themes.values():
-            if t.get('archetype'):
-                archetype_counts[t['archetype']] += 1
+        archetype = profile.archetype
         
-        total_themes = len(all_themes)
-        current_count = archetype_counts[archetype]
+        # Archetype frequency comes from the precomputed pool counts
+        current_count = archetype_counts[archetype] if archetype else 0
         
         # Bonus for rare archetypes
         rarity_score = 1.0 - (current_count / max(total_themes, 1))
@@ -741,8 +1032,8 @@ class ThemeExtractor:
     
     def _print_selection_summary(self, selected_themes: Dict[str, Dict[str, Any]]):
         """Print a summary of selected themes."""
-        print(f"\n📋 THEME SELECTION SUMMARY:")
-        print("=" * 50)
+        # Collect the whole report and write it with a single print call
+        lines = [f"\n📋 THEME SELECTION SUMMARY:", "=" * 50]
         
         # Group by color count
         mono_themes = {name: theme for name, theme in selected_themes.items() 
@@ -750,49 +1041,44 @@ class ThemeExtractor:
         dual_themes = {name: theme for name, theme in selected_themes.items() 
                       if len(theme['colors']) == 2}
         
+        # Resolve archetype display labels once for every section below
+        archetype_labels = {
+            name: theme['archetype'].value if isinstance(theme['archetype'], Enum) else str(theme['archetype'])
+            for name, theme in selected_themes.items()
+        }
+        
         # Mono-color themes with color distribution
         if mono_themes:
-            print("🟡 MONO-COLOR THEMES:")
+            lines.append("🟡 MONO-COLOR THEMES:")
             
             # Group by color for distribution display
             color_groups = defaultdict(list)
             for name, theme in mono_themes.items():
-                color = theme['colors'][0]
-                if '.' in color:
-                    color_key = color.split('.')[-1]
-                else:
-                    color_key = color
-                color_groups[color_key].append((name, theme))
+                color_groups[_short_colors(tuple(theme['colors']))[0]].append((name, theme))
             
             # Display by color
             color_names = {'W': 'White', 'U': 'Blue', 'B': 'Black', 'R': 'Red', 'G': 'Green'}
             for color in ['W', 'U', 'B', 'R', 'G']:
                 if color in color_groups:
-                    print(f"  {color_names[color]} ({color}): {len(color_groups[color])} themes")
+                    lines.append(f"  {color_names[color]} ({color}): {len(color_groups[color])} themes")
                     for name, theme in sorted(color_groups[color]):
-                        archetype = theme['archetype'].value if hasattr(theme['archetype'], 'value') else str(theme['archetype'])
-                        print(f"    • {name:<25} - {archetype}")
+                        lines.append(f"    • {name:<25} - {archetype_labels[name]}")
                 else:
-                    print(f"  {color_names[color]} ({color}): 0 themes")
+                    lines.append(f"  {color_names[color]} ({color}): 0 themes")
         
         # Dual-color themes  
         if dual_themes:
-            print("\n🎭 DUAL-COLOR THEMES:")
+            lines.append("\n🎭 DUAL-COLOR THEMES:")
             for name, theme in sorted(dual_themes.items()):
-                colors = '+'.join([c.split('.')[-1] if '.' in c else c for c in theme['colors']])
-                archetype = theme['archetype'].value if hasattr(theme['archetype'], 'value') else str(theme['archetype'])
-                print(f"  • {name:<25} ({colors}) - {archetype}")
+                colors = '+'.join(_short_colors(tuple(theme['colors'])))
+                lines.append(f"  • {name:<25} ({colors}) - {archetype_labels[name]}")
         
         # Archetype distribution
-        archetype_counts = defaultdict(int)
-        for theme in selected_themes.values():
-            archetype = theme['archetype']
-            if hasattr(archetype, 'value'):
-                archetype = archetype.value
-            archetype_counts[str(archetype)] += 1
-        
-        print(f"\n🎯 ARCHETYPE DISTRIBUTION:")
+        archetype_counts = Counter(archetype_labels.values())
+        
+        lines.append(f"\n🎯 ARCHETYPE DISTRIBUTION:")
         for archetype, count in sorted(archetype_counts.items()):
-            print(f"  • {archetype:<12}: {count} themes")
+            lines.append(f"  • {archetype:<12}: {count} themes")
         
-        print(f"\n✅ Ready for deck construction with {len(selected_themes)} optimized themes!")
+        lines.append(f"\n✅ Ready for deck construction with {len(selected_themes)} optimized themes!")
+        print("\n".join(lines))
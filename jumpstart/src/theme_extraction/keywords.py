@@ -8,25 +8,104 @@ Validation Results Summary:
 - Overall accuracy: 98.4%
 - Cards analyzed: 32,383
 - Sets needing improvement: AGGRESSIVE, TRIBAL, CONTROL
+
+Keyword sets are frozensets: they are read-only lookup tables.
 """
 
-from typing import Set
+import re
+import sys
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Sequence, Set, Tuple
+
+# Characters that make a keyword a regex pattern rather than a literal substring. Regex
+# keywords are kept out of the literal scanner and matched through compiled patterns.
+# '+' is not included: keywords like '+1/+1' and 'gets +' are meant literally.
+REGEX_CHARS = frozenset('.*?[]{}()|^$\\')
+
+
+def is_regex_keyword(keyword: str) -> bool:
+    """Check whether a keyword is a regex pattern (e.g. 'when.*dies') rather than plain text."""
+    return any(c in REGEX_CHARS for c in keyword)
+
+
+def classify_keywords(keywords: FrozenSet[str]) -> Tuple[FrozenSet[str], Tuple[Pattern, ...]]:
+    """Split a keyword set into literal substrings and compiled regex patterns."""
+    literals = frozenset(k for k in keywords if not is_regex_keyword(k))
+    patterns = tuple(re.compile(k) for k in sorted(keywords) if is_regex_keyword(k))
+    return literals, patterns
+
+
+def compile_keyword_union(patterns: Iterable[str]) -> Optional[Pattern]:
+    """Compile regex keywords into one alternation, so a single search tests all of them."""
+    patterns = tuple(sorted(patterns))
+    if not patterns:
+        return None
+    return _compile_union(patterns)
+
+
+@lru_cache(maxsize=None)
+def _compile_union(patterns: Tuple[str, ...]) -> Pattern:
+    """Compiled alternation for a sorted tuple of patterns, built once per process.
+    
+    Patterns sharing a literal head before their first '.*' are factored into one branch,
+    e.g. 'when(?:.*dies|.*enters)', so the engine tries that head once per position.
+    """
+    alternatives = []
+    tails: Dict[str, List[str]] = {}
+    for pattern in patterns:
+        head, sep, tail = pattern.partition('.*')
+        if sep and head and not is_regex_keyword(head) and '|' not in tail:
+            tails.setdefault(head, []).append(sep + tail)
+        else:
+            alternatives.append(f'(?:{pattern})')
+    alternatives.extend(f"{head}(?:{'|'.join(head_tails)})" for head, head_tails in tails.items())
+    return re.compile('|'.join(alternatives))
+
+
+def trie_regex(keywords: Iterable[str]) -> str:
+    """Build a regex matching any keyword, factored by shared prefixes like a compact trie.
+    
+    Optional branches are greedy, so the match at a position is the longest keyword there.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}  # End of a keyword
+    return _trie_node_regex(trie)
+
+
+def _trie_node_regex(node: Dict[str, dict]) -> str:
+    branches = [re.escape(char) + _trie_node_regex(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    # A keyword ending here makes the longer continuations optional
+    return f'(?:{body})?' if '' in node else body
+
+
+def _keyword_set(keywords: Set[str]) -> FrozenSet[str]:
+    """Freeze a keyword set, interning each keyword so equal strings share one object."""
+    return frozenset(map(sys.intern, keywords))
+
 
-TRIBAL_TYPES = {
+TRIBAL_TYPES: FrozenSet[str] = _keyword_set({
     'soldier', 'wizard', 'goblin', 'elf', 'zombie', 'angel', 'dragon', 
     'beast', 'bird', 'cat', 'dog', 'human', 'vampire', 'werewolf',
     'knight', 'warrior', 'rogue', 'cleric', 'shaman', 'druid',
     'sliver', 'eldrazi', 'pirate', 'merfolk', 'faerie', 'ninja',
     # Additional context-specific terms
     'tribal', 'creature type', 'shares a creature type'
-}
+})
 
-EQUIPMENT_KEYWORDS = {
+EQUIPMENT_KEYWORDS: FrozenSet[str] = _keyword_set({
     'equipment', 'equip', 'equipped', 'attach', 'metalcraft', 'artifact',
     'sword', 'blade', 'armor', 'weapon', 'improvise', 'construct', 'servo'
-}
+})
 
-AGGRESSIVE_KEYWORDS = {
+AGGRESSIVE_KEYWORDS: FrozenSet[str] = _keyword_set({
     # Core aggressive abilities - specific keyword abilities
     'haste', 'first strike', 'double strike', 'menace', 
     'trample', 'vigilance', 'intimidate', 'fear',
@@ -57,9 +136,9 @@ AGGRESSIVE_KEYWORDS = {
     
     # Aggressive descriptors (when used in context)
     'hasty', 'aggressive', 'rush'
-}
+})
 
-CONTROL_KEYWORDS = {
+CONTROL_KEYWORDS: FrozenSet[str] = _keyword_set({
     # Pure counterspell terms (clearly control)
     'counterspell', 'counter target spell', 'counter target', 'permission',
     
@@ -92,172 +171,172 @@ CONTROL_KEYWORDS = {
     # Specific control patterns
     'end of turn', 'during.*upkeep', 'at the beginning',
     'bounce', 'return to hand', 'return to owner'
-}
+})
 
-RAMP_KEYWORDS = {
+RAMP_KEYWORDS: FrozenSet[str] = _keyword_set({
     'mana', 'land', 'search', 'expensive', 'big', 'ritual', 'ramp',
     'additional mana', 'mana acceleration', 'lands matter'
-}
+})
 
-TEMPO_KEYWORDS = {
+TEMPO_KEYWORDS: FrozenSet[str] = _keyword_set({
     'bounce', 'return', 'tap', 'counter', 'flash', 'cheap', 'efficient',
     'draw', 'cantrip', 'pressure', 'disrupt', 'tempo'
-}
+})
 
-COMBO_KEYWORDS = {
+COMBO_KEYWORDS: FrozenSet[str] = _keyword_set({
     'combo', 'synergy', 'enters', 'sacrifice', 'triggered', 'ability',
     'when', 'whenever', 'cost reduction', 'infinite', 'untap', 'activated',
     'goes infinite', 'loop', 'repeat this process', 'copy this spell'
     # Focus on specific combo enablers rather than general synergy
-}
+})
 
-VOLTRON_KEYWORDS = {
+VOLTRON_KEYWORDS: FrozenSet[str] = _keyword_set({
     'aura', 'enchant', 'attach', 'equipped', 'gets +', 'hexproof',
     'protection', 'indestructible', 'unblockable', 'trample', 'enchantment'
-}
+})
 
-ARISTOCRATS_KEYWORDS = {
+ARISTOCRATS_KEYWORDS: FrozenSet[str] = _keyword_set({
     'sacrifice', 'dies', 'death', 'creature dies', 'when.*dies',
     'blood artist', 'drain', 'token', 'creature token', 'etb', 'leaves'
-}
+})
 
-GRAVEYARD_KEYWORDS = {
+GRAVEYARD_KEYWORDS: FrozenSet[str] = _keyword_set({
     'graveyard', 'return', 'flashback', 'escape', 'delve', 'threshold',
     'mill', 'self-mill', 'dredge', 'reanimator', 'from.*graveyard'
-}
+})
 
-BURN_KEYWORDS = {
+BURN_KEYWORDS: FrozenSet[str] = _keyword_set({
     'damage', 'burn', 'shock', 'bolt', 'deals.*damage', 'ping',
     'direct damage', 'face damage', 'player', 'target.*player'
-}
+})
 
-SPELLSLINGER_KEYWORDS = {
+SPELLSLINGER_KEYWORDS: FrozenSet[str] = _keyword_set({
     'instant', 'sorcery', 'prowess', 'spell', 'cast', 'magecraft',
     'storm', 'copy', 'fork', 'noncreature spell'
-}
+})
 
-LIFEGAIN_KEYWORDS = {
+LIFEGAIN_KEYWORDS: FrozenSet[str] = _keyword_set({
     'lifegain', 'gain.*life', 'lifelink', 'soul sister', 'soul warden',
     'when.*gain.*life', 'life total', 'life you gained', 'whenever.*gain.*life'
-}
+})
 
-TOKEN_KEYWORDS = {
+TOKEN_KEYWORDS: FrozenSet[str] = _keyword_set({
     'token', 'create.*token', 'creature token', 'artifact token',
     'populate', 'convoke', 'go wide', 'amass', 'fabricate'
-}
+})
 
-ENCHANTMENTS_KEYWORDS = {
+ENCHANTMENTS_KEYWORDS: FrozenSet[str] = _keyword_set({
     'enchantment', 'constellation', 'enchantress', 'aura', 'enchant',
     'enchantments matter', 'when.*enchantment.*enters'
-}
+})
 
-COUNTERS_KEYWORDS = {
+COUNTERS_KEYWORDS: FrozenSet[str] = _keyword_set({
     'counter', '+1/+1', 'modular', 'evolve', 'proliferate', 'graft',
     'adapt', 'monstrosity', 'renown', 'outlast', 'bolster'
-}
+})
 
-MILL_KEYWORDS = {
+MILL_KEYWORDS: FrozenSet[str] = _keyword_set({
     'mill', 'library', 'top.*library', 'bottom.*library', 'self-mill',
     'surveil', 'look.*top', 'cards.*library'
-}
+})
 
-LANDFALL_KEYWORDS = {
+LANDFALL_KEYWORDS: FrozenSet[str] = _keyword_set({
     'landfall', 'land.*enters', 'whenever.*land', 'land drop',
     'lands matter', 'additional land', 'extra land'
-}
+})
 
-CYCLING_KEYWORDS = {
+CYCLING_KEYWORDS: FrozenSet[str] = _keyword_set({
     'cycling', 'cycle', 'discard.*draw', 'whenever.*cycle',
     'cycling matters', 'astral slide', 'lightning rift'
-}
+})
 
-MADNESS_KEYWORDS = {
+MADNESS_KEYWORDS: FrozenSet[str] = _keyword_set({
     'madness', 'discard', 'whenever.*discard', 'hellbent',
     'empty hand', 'no cards in hand', 'graveyard size'
-}
+})
 
-MIDRANGE_KEYWORDS = {
+MIDRANGE_KEYWORDS: FrozenSet[str] = _keyword_set({
     'efficient', 'value', 'threat', 'removal', 'interaction', 'versatile',
     'good stats', 'card advantage', 'flexible', 'balanced', 'quality',
     'solid', 'reasonable', 'enters.*battlefield', 'when.*enters'
-}
+})
 
-VEHICLES_KEYWORDS = {
+VEHICLES_KEYWORDS: FrozenSet[str] = _keyword_set({
     'vehicle', 'crew', 'pilot', 'artifact creature', 'becomes.*creature',
     'crewed', 'manning'
-}
+})
 
-PLANESWALKERS_KEYWORDS = {
+PLANESWALKERS_KEYWORDS: FrozenSet[str] = _keyword_set({
     'planeswalker', 'loyalty', 'superfriends', 'planeswalkers matter',
     'whenever.*planeswalker', 'loyalty counter'
-}
+})
 
-HISTORIC_KEYWORDS = {
+HISTORIC_KEYWORDS: FrozenSet[str] = _keyword_set({
     'historic', 'legendary', 'artifact', 'saga', 'historic spell',
     'artifacts.*legendaries.*sagas'
-}
+})
 
-KICKER_KEYWORDS = {
+KICKER_KEYWORDS: FrozenSet[str] = _keyword_set({
     'kicker', 'kicked', 'additional cost', 'multikicker', 'entwine',
     'modal', 'choose.*mode', 'if.*kicked'
-}
+})
 
-MULTICOLOR_KEYWORDS = {
+MULTICOLOR_KEYWORDS: FrozenSet[str] = _keyword_set({
     'multicolored', 'domain', 'converge', 'sunburst', 'basic land types',
     'different.*colors', 'five colors', 'rainbow'
-}
+})
 
-BLINK_KEYWORDS = {
+BLINK_KEYWORDS: FrozenSet[str] = _keyword_set({
     'blink', 'flicker', 'exile.*return', 'enters.*battlefield',
     'etb', 'leaves.*battlefield', 'when.*enters', 'triggered ability'
-}
+})
 
-SACRIFICE_KEYWORDS = {
+SACRIFICE_KEYWORDS: FrozenSet[str] = _keyword_set({
     'sacrifice', 'sac', 'as.*additional.*cost', 'devour', 'exploit',
     'emerge', 'offering', 'altar'
-}
+})
 
-STORM_KEYWORDS = {
+STORM_KEYWORDS: FrozenSet[str] = _keyword_set({
     'storm', 'spell.*cast.*turn', 'copy.*spell', 'replicate',
     'cascade', 'suspend', 'rebound'
-}
+})
 
-INFECT_KEYWORDS = {
+INFECT_KEYWORDS: FrozenSet[str] = _keyword_set({
     'infect', 'poisonous', 'poison counter', 'infected', 'toxic',
     'wither', 'persist', '-1/-1 counter'
-}
+})
 
-REANIMATOR_KEYWORDS = {
+REANIMATOR_KEYWORDS: FrozenSet[str] = _keyword_set({
     'reanimate', 'animate dead', 'return.*creature.*graveyard', 'resurrection',
     'unearth', 'persist', 'undying', 'return.*battlefield', 'brings back'
-}
+})
 
-SLIVERS_KEYWORDS = {
+SLIVERS_KEYWORDS: FrozenSet[str] = _keyword_set({
     'sliver', 'all slivers', 'sliver creatures', 'shared', 'abilities',
     'all creatures share', 'gains', 'have'
-}
+})
 
-ELDRAZI_KEYWORDS = {
+ELDRAZI_KEYWORDS: FrozenSet[str] = _keyword_set({
     'eldrazi', 'annihilator', 'devoid', 'colorless', 'exile.*permanent',
     'ingest', 'process', 'void', 'emerge', 'large'
-}
+})
 
-ENERGY_KEYWORDS = {
+ENERGY_KEYWORDS: FrozenSet[str] = _keyword_set({
     'energy', 'energy counter', 'get.*energy', 'pay.*energy',
     'fabricate', 'servo', 'aetherworks'
-}
+})
 
-DEVOTION_KEYWORDS = {
+DEVOTION_KEYWORDS: FrozenSet[str] = _keyword_set({
     'devotion', 'mana symbols', 'permanents you control', 'among permanents',
     'devotion to', 'colored mana symbols'
-}
+})
 
-AFFINITY_KEYWORDS = {
+AFFINITY_KEYWORDS: FrozenSet[str] = _keyword_set({
     'affinity', 'artifact', 'metalcraft', 'costs.*less', 'improvise',
     'artifact spells', 'artifact creatures', 'cost reduction'
-}
+})
 
-ALL_KEYWORD_SETS = {
+ALL_KEYWORD_SETS: Dict[str, FrozenSet[str]] = {
     'TRIBAL_TYPES': TRIBAL_TYPES,
     'EQUIPMENT_KEYWORDS': EQUIPMENT_KEYWORDS,
     'AGGRESSIVE_KEYWORDS': AGGRESSIVE_KEYWORDS,
@@ -295,3 +374,69 @@ ALL_KEYWORD_SETS = {
     'DEVOTION_KEYWORDS': DEVOTION_KEYWORDS,
     'AFFINITY_KEYWORDS': AFFINITY_KEYWORDS,
 }
+
+# The keyword scanner is only built on first use; module attribute access to its keyword
+# list goes through __getattr__ (PEP 562) below
+
+
+@lru_cache(maxsize=None)
+def _scanner_tables() -> Tuple[Tuple[str, ...], Pattern, Dict[str, FrozenSet[str]]]:
+    """Single-pass scanner for every literal keyword across all sets.
+    
+    The lookahead reports the longest keyword starting at each position (the trie pattern
+    prefers longer matches); any keyword that is a substring of a reported one is implied by
+    it, via its substring closure.
+    """
+    literal_keywords = tuple(sorted(
+        {k for keywords in ALL_KEYWORD_SETS.values() for k in keywords if not is_regex_keyword(k)},
+        key=lambda k: (-len(k), k)
+    ))
+    scanner = re.compile('(?=(' + trie_regex(literal_keywords) + '))')
+    closure = {
+        keyword: frozenset(other for other in literal_keywords if other in keyword)
+        for keyword in literal_keywords
+    }
+    return literal_keywords, scanner, closure
+
+
+def scan_literal_keyword_rows(texts: Sequence[str]) -> Set[Tuple[int, str]]:
+    """(row, keyword) for every literal keyword contained in each lowercase text.
+    
+    The texts are joined and scanned in a single pass; keywords never contain the NUL
+    separator, so no hit spans two texts.
+    """
+    _, scanner, closure = _scanner_tables()
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + 1
+    
+    longest_hits = {(bisect_right(starts, m.start()) - 1, m.group(1)) for m in scanner.finditer('\0'.join(texts))}
+    return {(row, keyword) for row, longest in longest_hits for keyword in closure[longest]}
+
+# Lazily built module attributes: LITERAL_KEYWORDS is every literal keyword, longest first
+_LAZY_TABLES = {
+    'LITERAL_KEYWORDS': lambda: _scanner_tables()[0],
+}
+
+
+def __getattr__(name: str):
+    """Build a derived keyword table on first access and cache it as a module global."""
+    if name in _LAZY_TABLES:
+        value = globals()[name] = _LAZY_TABLES[name]()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *_LAZY_TABLES})
+
+# Public names, so `from .keywords import *` brings in the keyword tables and helpers only.
+# The lazy tables are left out so a star import doesn't build them.
+__all__ = [
+    *ALL_KEYWORD_SETS,
+    'ALL_KEYWORD_SETS',
+    'REGEX_CHARS', 'is_regex_keyword', 'classify_keywords', 'compile_keyword_union',
+    'trie_regex', 'scan_literal_keyword_rows',
+]
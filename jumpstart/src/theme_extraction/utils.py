@@ -1,10 +1,57 @@
 """Utility functions for theme extraction and code generation."""
 
+from functools import lru_cache
 from typing import Dict, Any
 import pandas as pd
+from ..enums import Archetype
 from .extractor import ThemeExtractor
 
 
+# MagicColor references for theme colors in generated code
+COLOR_MAP = {
+    'W': "MagicColor.WHITE.value",
+    'U': "MagicColor.BLUE.value",
+    'B': "MagicColor.BLACK.value",
+    'R': "MagicColor.RED.value",
+    'G': "MagicColor.GREEN.value",
+    'C': "MagicColor.COLORLESS.value",
+}
+
+@lru_cache(maxsize=None)
+def _format_colors(colors: tuple) -> str:
+    """Format a theme's colors as MagicColor references where possible, once per color tuple."""
+    return ', '.join([COLOR_MAP.get(color, f"'{color}'") for color in colors])
+
+
+# Enum member names for generated Archetype references
+ARCHETYPE_NAMES = {archetype: archetype.name for archetype in Archetype}
+
+# Generated code for a single theme entry (string values are rendered with repr, so quotes
+# and backslashes in names or strategies are escaped into valid Python)
+_CODE_HEADER = (
+    "# Auto-generated themes from theme extraction\n"
+    "from .enums import Archetype, MagicColor\n"
+    "from .scorer import (\n"
+    "    create_default_scorer, create_tribal_scorer, create_equipment_scorer,\n"
+    "    create_aggressive_scorer, create_stompy_scorer, create_artifact_scorer,\n"
+    "    create_control_scorer\n"
+    ")\n"
+    "\n"
+    "{variable_name} = {{"
+)
+
+_THEME_TEMPLATE = (
+    "    {name!r}: {{\n"
+    "        'colors': [{colors}],\n"
+    "        'strategy': {strategy!r},\n"
+    "        'keywords': {keywords!r},\n"
+    "        'archetype': Archetype.{archetype},\n"
+    "        'scorer': {scorer},\n"
+    "        'core_card_count': {core_card_count}\n"
+    "    }},"
+)
+
+
 def extract_themes_from_oracle(oracle_df: pd.DataFrame, 
                               min_cards_per_theme: int = 10) -> Dict[str, Dict[str, Any]]:
     """
@@ -23,18 +70,7 @@ def extract_themes_from_oracle(oracle_df: pd.DataFrame,
 
 def generate_theme_code(themes: Dict[str, Dict[str, Any]], 
                        variable_name: str = "EXTRACTED_THEMES") -> Dict[str, Dict[str, Any]]:
-    """
-    Generate theme dictionary in the same format as ALL_THEMES.
-    
-    Args:
-        themes: Dictionary of theme configurations
-        variable_name: Name for the generated variable (kept for backwards compatibility)
-        
-    Returns:
-        Dictionary of themes in the exact same format as ALL_THEMES, ready to use directly
-    """
-    # Return the themes in the exact same format as ALL_THEMES
-    # The structure is already correct, just return as-is
+    """Return themes unchanged: they are already in the ALL_THEMES format (kept for backwards compatibility)."""
     return themes
 
 
@@ -50,46 +86,17 @@ def generate_theme_code_string(themes: Dict[str, Dict[str, Any]],
     Returns:
         Python code string that can be added to consts.py
     """
-    lines = [
-        "# Auto-generated themes from theme extraction",
-        "from .enums import Archetype, MagicColor",
-        "from .scorer import (",
-        "    create_default_scorer, create_tribal_scorer, create_equipment_scorer,",
-        "    create_aggressive_scorer, create_stompy_scorer, create_artifact_scorer,",
-        "    create_control_scorer",
-        ")",
-        "",
-        f"{variable_name} = {{"
-    ]
-    
-    for theme_name, theme_config in themes.items():
-        lines.append(f"    '{theme_name}': {{")
-        
-        # Format colors to use MagicColor references if possible
-        colors_formatted = []
-        for color in theme_config['colors']:
-            if color == 'W':
-                colors_formatted.append("MagicColor.WHITE.value")
-            elif color == 'U':
-                colors_formatted.append("MagicColor.BLUE.value")
-            elif color == 'B':
-                colors_formatted.append("MagicColor.BLACK.value")
-            elif color == 'R':
-                colors_formatted.append("MagicColor.RED.value")
-            elif color == 'G':
-                colors_formatted.append("MagicColor.GREEN.value")
-            elif color == 'C':
-                colors_formatted.append("MagicColor.COLORLESS.value")
-            else:
-                colors_formatted.append(f"'{color}'")
-        
-        lines.append(f"        'colors': [{', '.join(colors_formatted)}],")
-        lines.append(f"        'strategy': '{theme_config['strategy']}',")
-        lines.append(f"        'keywords': {theme_config['keywords']},")
-        lines.append(f"        'archetype': Archetype.{theme_config['archetype'].name},")
-        lines.append(f"        'scorer': {theme_config['scorer'].__name__},")
-        lines.append(f"        'core_card_count': {theme_config['core_card_count']}")
-        lines.append("    },")
-    
-    lines.append("}")
-    return "\n".join(lines)
+    theme_blocks = (
+        _THEME_TEMPLATE.format(
+            name=theme_name,
+            colors=_format_colors(tuple(theme_config['colors'])),
+            strategy=theme_config['strategy'],
+            # Sorted so regenerated code is stable regardless of set iteration order
+            keywords=sorted(theme_config['keywords']),
+            archetype=ARCHETYPE_NAMES[theme_config['archetype']],
+            scorer=theme_config['scorer'].__name__,
+            core_card_count=theme_config['core_card_count'],
+        )
+        for theme_name, theme_config in themes.items()
+    )
+    return "\n".join([_CODE_HEADER.format(variable_name=variable_name), *theme_blocks, "}"])
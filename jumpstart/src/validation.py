@@ -5,8 +5,9 @@ This module contains functions to validate deck construction results,
 check for constraint compliance, and analyze card distribution.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from .enums import MagicColor
 
 # from src.validation import (
@@ -19,57 +20,113 @@ from .enums import MagicColor
 
 from .construct.core import CardConstraints
 
+# Color codes and display names for the per-color usage report
+_ALL_COLORS: Tuple[str, ...] = tuple(MagicColor.all_colors_including_colorless())
+_COLOR_NAMES: Dict[str, str] = MagicColor.color_names()
+_COLORLESS = MagicColor.COLORLESS.value
 
-def validate_card_uniqueness(deck_dataframes: Dict[str, pd.DataFrame]) -> Dict:
+
+def _stack_decks(deck_dataframes: Dict[str, pd.DataFrame], columns: List[str]) -> pd.DataFrame:
+    """
+    Concatenate the given columns of every non-empty deck, tagging each row with its theme.
+    
+    Card names are also factorized into int32 'name_code' values, numbered in order
+    of first appearance, so the validators can count and compare integers.
+    
+    Args:
+        deck_dataframes: Dictionary mapping theme names to their deck DataFrames
+        columns: Deck columns to keep, including 'name'
+    
+    Returns:
+        pd.DataFrame: One row per card in deck order, plus '_theme' and 'name_code' columns
+    """
+    frames = [deck_df[columns].assign(_theme=theme_name)
+              for theme_name, deck_df in deck_dataframes.items() if not deck_df.empty]
+    if not frames:
+        return pd.DataFrame(columns=columns + ['_theme']).assign(name_code=np.array([], dtype=np.int32))
+    all_cards = pd.concat(frames, ignore_index=True)
+    all_cards['name_code'] = pd.factorize(all_cards['name'].to_numpy(), use_na_sentinel=False)[0].astype(np.int32)
+    return all_cards
+
+
+def _creature_land_masks(types: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Flag creature and land rows of a Type column with literal, case-insensitive matches.
+    
+    The column is dictionary-encoded first so the string matching runs once per
+    distinct type line; rows are then flagged through their integer category codes.
+    
+    Args:
+        types: Card Type column
+    
+    Returns:
+        tuple: (is_creature, is_land) boolean Series aligned with types
+    """
+    categorical = types.astype('category').cat
+    lowered = categorical.categories.astype(object).str.lower()
+    codes = categorical.codes.to_numpy()
+    
+    def flag(word: str) -> pd.Series:
+        # Missing types have code -1, which picks the trailing False
+        per_category = np.append(np.asarray(lowered.str.contains(word, regex=False), dtype=bool), False)
+        return pd.Series(per_category[codes], index=types.index)
+    
+    return flag('creature'), flag('land')
+
+
+def validate_card_uniqueness(deck_dataframes: Dict[str, pd.DataFrame], all_cards: Optional[pd.DataFrame] = None) -> Dict:
     """
     Validate that no card appears in multiple decks.
     
     Args:
         deck_dataframes: Dictionary mapping theme names to their deck DataFrames
+        all_cards: Optional pre-stacked deck cards from _stack_decks()
     
     Returns:
         dict: Validation results with duplicates info
     """
     
-    print("🔍 VALIDATING CARD UNIQUENESS")
-    print("=" * 50)
+    lines = ["🔍 VALIDATING CARD UNIQUENESS", "=" * 50]
     
-    # Track all cards and where they appear
-    card_usage = {}  # card_name -> list of themes using it
-    total_cards = 0
+    # Stack every deck's card names with the theme they belong to
+    if all_cards is None:
+        all_cards = _stack_decks(deck_dataframes, ['name'])
+    total_cards = len(all_cards)
     
-    # Collect all cards from all decks
-    for theme_name, deck_df in deck_dataframes.items():
-        if deck_df.empty:
-            continue
-            
-        total_cards += len(deck_df)
+    # Tally name codes; when every name is distinct there is nothing to group
+    codes = all_cards['name_code'].to_numpy()
+    counts = np.bincount(codes)
+    if len(counts) == total_cards:
+        unique_cards = total_cards
+        duplicates = {}
+    else:
+        unique_cards = int(np.count_nonzero(counts == 1))
+        
+        # First row of each code, found by writing row numbers back to front
+        first_rows = np.empty(len(counts), dtype=np.intp)
+        first_rows[codes[::-1]] = np.arange(total_cards - 1, -1, -1)
+        names = all_cards['name'].to_numpy()
         
-        for _, card in deck_df.iterrows():
-            card_name = card['name']
-            
-            if card_name not in card_usage:
-                card_usage[card_name] = []
-            
-            card_usage[card_name].append(theme_name)
-    
-    # Find duplicates
-    duplicates = {card: themes for card, themes in card_usage.items() if len(themes) > 1}
-    unique_cards = len([card for card, themes in card_usage.items() if len(themes) == 1])
-    
-    print(f"📊 VALIDATION RESULTS:")
-    print(f"Total cards across all decks: {total_cards}")
-    print(f"Unique cards used: {unique_cards}")
-    print(f"Duplicate cards found: {len(duplicates)}")
+        duplicates = {names[first_rows[code]]: [] for code in np.flatnonzero(counts > 1)}
+        is_dup = counts[codes] > 1
+        for code, theme_name in zip(codes[is_dup], all_cards['_theme'].to_numpy()[is_dup]):
+            duplicates[names[first_rows[code]]].append(theme_name)
+    
+    lines.append(f"📊 VALIDATION RESULTS:")
+    lines.append(f"Total cards across all decks: {total_cards}")
+    lines.append(f"Unique cards used: {unique_cards}")
+    lines.append(f"Duplicate cards found: {len(duplicates)}")
     
     if duplicates:
-        print(f"\n❌ DUPLICATE CARDS DETECTED:")
+        lines.append(f"\n❌ DUPLICATE CARDS DETECTED:")
         for card_name, themes in duplicates.items():
-            print(f"  '{card_name}' appears in: {', '.join(themes)}")
+            lines.append(f"  '{card_name}' appears in: {', '.join(themes)}")
         
         # Count how many extra cards we have due to duplicates
         extra_cards = sum(len(themes) - 1 for themes in duplicates.values())
-        print(f"\nTotal duplicate instances: {extra_cards}")
+        lines.append(f"\nTotal duplicate instances: {extra_cards}")
+        
+        print("\n".join(lines))
         
         return {
             'valid': False,
@@ -80,8 +137,10 @@ def validate_card_uniqueness(deck_dataframes: Dict[str, pd.DataFrame]) -> Dict:
             'extra_instances': extra_cards
         }
     else:
-        print(f"\n✅ VALIDATION PASSED!")
-        print(f"All {unique_cards} cards are used exactly once.")
+        lines.append(f"\n✅ VALIDATION PASSED!")
+        lines.append(f"All {unique_cards} cards are used exactly once.")
+        
+        print("\n".join(lines))
         
         return {
             'valid': True,
@@ -93,7 +152,41 @@ def validate_card_uniqueness(deck_dataframes: Dict[str, pd.DataFrame]) -> Dict:
         }
 
 
-def validate_deck_constraints(deck_dataframes: Dict[str, pd.DataFrame], all_themes: Dict, constraints: CardConstraints) -> Dict:
+def _deck_violations(creature_count: int, unique_lands: int, deck_size: int,
+                     is_mono_color: bool, constraints: CardConstraints) -> List[str]:
+    """
+    Check one deck's counts against the deck building rules.
+    
+    Args:
+        creature_count: Number of creatures in the deck
+        unique_lands: Number of distinct land names in the deck
+        deck_size: Total number of cards in the deck
+        is_mono_color: Whether the deck's theme is mono-colored
+        constraints: CardConstraints object defining the deck building rules
+    
+    Returns:
+        list: Violation messages, empty when the deck is valid
+    """
+    violations = []
+    
+    # Creature limit
+    if creature_count > constraints.max_creatures:
+        violations.append(f"Too many creatures: {creature_count}/{constraints.max_creatures}")
+    
+    # Land limit
+    max_lands = constraints.get_max_lands(is_mono_color)
+    if unique_lands > max_lands:
+        violations.append(f"Too many unique lands: {unique_lands}/{max_lands}")
+    
+    # Deck size
+    if deck_size != constraints.target_deck_size:
+        violations.append(f"Wrong deck size: {deck_size}/{constraints.target_deck_size}")
+    
+    return violations
+
+
+def validate_deck_constraints(deck_dataframes: Dict[str, pd.DataFrame], all_themes: Dict, constraints: CardConstraints,
+                              all_cards: Optional[pd.DataFrame] = None) -> Dict:
     """
     Validate that all deck construction constraints are met.
     
@@ -101,73 +194,71 @@ def validate_deck_constraints(deck_dataframes: Dict[str, pd.DataFrame], all_them
         deck_dataframes: Dictionary mapping theme names to their deck DataFrames
         all_themes: Dictionary of all theme configurations
         constraints: CardConstraints object defining the deck building rules
+        all_cards: Optional pre-stacked deck cards from _stack_decks()
     
     Returns:
         dict: Validation results for constraints
     """
     
-    print("🔍 VALIDATING DECK CONSTRAINTS")
-    print("=" * 50)
+    lines = ["🔍 VALIDATING DECK CONSTRAINTS", "=" * 50]
     
     constraint_violations = []
-    valid_decks = 0
     
-    for theme_name, deck_df in deck_dataframes.items():
-        if deck_df.empty:
-            continue
-            
-        theme_config = all_themes.get(theme_name, {})
-        theme_colors = theme_config.get('colors', [])
-        is_mono_color = len(theme_colors) == 1
+    # Tag card types once across all decks, then count per theme
+    if all_cards is None:
+        all_cards = _stack_decks(deck_dataframes, ['name', 'Type'])
+    theme_codes, theme_names = pd.factorize(all_cards['_theme'].to_numpy())
+    n_themes = len(theme_names)
+    is_creature, is_land = _creature_land_masks(all_cards['Type'])
+    deck_sizes = np.bincount(theme_codes, minlength=n_themes)
+    creature_counts = np.bincount(theme_codes[is_creature.to_numpy()], minlength=n_themes)
+    
+    # Distinct (theme, land name) pairs, ignoring lands without a name
+    land_rows = is_land.to_numpy() & all_cards['name'].notna().to_numpy()
+    stride = len(all_cards) + 1
+    land_pairs = np.unique(theme_codes[land_rows].astype(np.int64) * stride
+                           + all_cards['name_code'].to_numpy()[land_rows])
+    unique_land_counts = np.bincount(land_pairs // stride, minlength=n_themes)
+    
+    # Apply every limit to all decks at once; only failing decks need messages
+    is_mono_color = np.array([len(all_themes.get(theme_name, {}).get('colors', [])) == 1
+                              for theme_name in theme_names], dtype=bool)
+    max_lands = np.where(is_mono_color, constraints.get_max_lands(True), constraints.get_max_lands(False))
+    failing = ((creature_counts > constraints.max_creatures)
+               | (unique_land_counts > max_lands)
+               | (deck_sizes != constraints.target_deck_size))
+    
+    for theme_code in np.flatnonzero(failing):
+        creature_count = int(creature_counts[theme_code])
+        unique_lands = int(unique_land_counts[theme_code])
+        deck_size = int(deck_sizes[theme_code])
         
-        # Count card types
-        creatures = deck_df[deck_df['Type'].str.contains('Creature', case=False, na=False)]
-        lands = deck_df[deck_df['Type'].str.contains('Land', case=False, na=False)]
-        
-        # Get unique land names
-        unique_lands = lands['name'].nunique() if not lands.empty else 0
-        
-        # Check constraints using CardConstraints object
-        violations = []
-        
-        # Creature limit
-        if len(creatures) > constraints.max_creatures:
-            violations.append(f"Too many creatures: {len(creatures)}/{constraints.max_creatures}")
-        
-        # Land limit
-        max_lands = constraints.get_max_lands(is_mono_color)
-        if unique_lands > max_lands:
-            violations.append(f"Too many unique lands: {unique_lands}/{max_lands}")
-        
-        # Deck size
-        if len(deck_df) != constraints.target_deck_size:
-            violations.append(f"Wrong deck size: {len(deck_df)}/{constraints.target_deck_size}")
-        
-        if violations:
-            constraint_violations.append({
-                'theme': theme_name,
-                'violations': violations,
-                'creatures': len(creatures),
-                'unique_lands': unique_lands,
-                'deck_size': len(deck_df)
-            })
-        else:
-            valid_decks += 1
-    
-    total_decks = len([df for df in deck_dataframes.values() if not df.empty])
-    
-    print(f"📊 CONSTRAINT VALIDATION RESULTS:")
-    print(f"Valid decks: {valid_decks}/{total_decks}")
-    print(f"Constraint violations: {len(constraint_violations)}")
+        constraint_violations.append({
+            'theme': theme_names[theme_code],
+            'violations': _deck_violations(creature_count, unique_lands, deck_size,
+                                           bool(is_mono_color[theme_code]), constraints),
+            'creatures': creature_count,
+            'unique_lands': unique_lands,
+            'deck_size': deck_size
+        })
+    valid_decks = n_themes - len(constraint_violations)
+    
+    total_decks = n_themes
+    
+    lines.append(f"📊 CONSTRAINT VALIDATION RESULTS:")
+    lines.append(f"Valid decks: {valid_decks}/{total_decks}")
+    lines.append(f"Constraint violations: {len(constraint_violations)}")
     
     if constraint_violations:
-        print(f"\n❌ CONSTRAINT VIOLATIONS:")
+        lines.append(f"\n❌ CONSTRAINT VIOLATIONS:")
         for violation in constraint_violations:
-            print(f"  {violation['theme']}:")
+            lines.append(f"  {violation['theme']}:")
             for v in violation['violations']:
-                print(f"    - {v}")
+                lines.append(f"    - {v}")
     else:
-        print(f"\n✅ ALL CONSTRAINTS SATISFIED!")
+        lines.append(f"\n✅ ALL CONSTRAINTS SATISFIED!")
+    
+    print("\n".join(lines))
     
     return {
         'valid': len(constraint_violations) == 0,
@@ -177,7 +268,8 @@ def validate_deck_constraints(deck_dataframes: Dict[str, pd.DataFrame], all_them
     }
 
 
-def analyze_card_distribution(deck_dataframes: Dict[str, pd.DataFrame], oracle_df: pd.DataFrame, constraints: CardConstraints) -> Dict:
+def analyze_card_distribution(deck_dataframes: Dict[str, pd.DataFrame], oracle_df: pd.DataFrame, constraints: CardConstraints,
+                              all_cards: Optional[pd.DataFrame] = None) -> Dict:
     """
     Analyze how cards are distributed across decks and themes.
     
@@ -185,50 +277,56 @@ def analyze_card_distribution(deck_dataframes: Dict[str, pd.DataFrame], oracle_d
         deck_dataframes: Dictionary mapping theme names to their deck DataFrames
         oracle_df: DataFrame with all available cards
         constraints: CardConstraints object defining the deck building rules
+        all_cards: Optional pre-stacked deck cards from _stack_decks()
     
     Returns:
         dict: Analysis results
     """
     
-    print("\n📈 CARD DISTRIBUTION ANALYSIS")
-    print("=" * 50)
+    lines = ["\n📈 CARD DISTRIBUTION ANALYSIS", "=" * 50]
     
     # Get all used cards
-    all_used_cards = set()
-    for deck_df in deck_dataframes.values():
-        if not deck_df.empty:
-            all_used_cards.update(deck_df['name'].tolist())
+    if all_cards is None:
+        all_cards = _stack_decks(deck_dataframes, ['name'])
+    all_used_cards = pd.Index(all_cards['name']).unique()
     
     total_available = len(oracle_df)
     total_used = len(all_used_cards)
     unused_count = total_available - total_used
     
-    print(f"📊 OVERALL STATISTICS:")
-    print(f"Total cards available: {total_available}")
-    print(f"Total cards used: {total_used}")
-    print(f"Cards unused: {unused_count}")
-    print(f"Usage rate: {total_used/total_available*100:.1f}%")
+    lines.append(f"📊 OVERALL STATISTICS:")
+    lines.append(f"Total cards available: {total_available}")
+    lines.append(f"Total cards used: {total_used}")
+    lines.append(f"Cards unused: {unused_count}")
+    lines.append(f"Usage rate: {total_used/total_available*100:.1f}%")
     
     # Analyze by color
-    print(f"\n🎨 USAGE BY COLOR:")
+    lines.append(f"\n🎨 USAGE BY COLOR:")
     color_stats = {}
-    color_names = MagicColor.color_names()
     
-    for color in MagicColor.all_colors_including_colorless():
-        color_cards = oracle_df[oracle_df['Color'] == color] if color != 'C' else oracle_df[oracle_df['Color'].isna() | (oracle_df['Color'] == '')]
-        available = len(color_cards)
-        
-        used_in_color = sum(1 for card_name in all_used_cards 
-                           if card_name in color_cards['name'].values)
+    # Only missing or empty colors count as colorless; a literal colorless code matches no color
+    oracle_colors = oracle_df['Color']
+    is_colorless = oracle_colors.isna() | (oracle_colors == '')
+    oracle_colors = oracle_colors.mask(oracle_colors == _COLORLESS).where(~is_colorless, _COLORLESS)
+    used_mask = oracle_df['name'].isin(all_used_cards)
+    available_by_color = oracle_colors.value_counts()
+    
+    # Each used card name counts once per color, even if the oracle lists it more than once
+    used_by_color = (pd.DataFrame({'name': oracle_df['name'], 'color': oracle_colors})[used_mask]
+                     .drop_duplicates()['color'].value_counts())
+    
+    for color in _ALL_COLORS:
+        available = int(available_by_color.get(color, 0))
+        used_in_color = int(used_by_color.get(color, 0))
         
         if available > 0:
             usage_pct = used_in_color / available * 100
-            color_name = color_names[color]
-            print(f"  {color_name:9}: {used_in_color:3d}/{available:3d} cards ({usage_pct:5.1f}%)")
+            color_name = _COLOR_NAMES[color]
+            lines.append(f"  {color_name:9}: {used_in_color:3d}/{available:3d} cards ({usage_pct:5.1f}%)")
             color_stats[color] = {'used': used_in_color, 'available': available, 'rate': usage_pct}
     
     # Analyze deck completeness
-    print(f"\n🎯 DECK COMPLETENESS:")
+    lines.append(f"\n🎯 DECK COMPLETENESS:")
     complete_decks = 0
     incomplete_decks = []
     
@@ -239,35 +337,35 @@ def analyze_card_distribution(deck_dataframes: Dict[str, pd.DataFrame], oracle_d
         elif deck_size > 0:
             incomplete_decks.append((theme_name, deck_size))
     
-    print(f"Complete decks ({constraints.target_deck_size} cards): {complete_decks}")
-    print(f"Incomplete decks: {len(incomplete_decks)}")
+    lines.append(f"Complete decks ({constraints.target_deck_size} cards): {complete_decks}")
+    lines.append(f"Incomplete decks: {len(incomplete_decks)}")
     
     if incomplete_decks:
-        print(f"\nIncomplete deck details:")
+        lines.append(f"\nIncomplete deck details:")
         for theme, size in incomplete_decks:
-            print(f"  {theme}: {size}/{constraints.target_deck_size} cards")
+            lines.append(f"  {theme}: {size}/{constraints.target_deck_size} cards")
     
     # Analyze unused cards by type
     if unused_count > 0:
-        print(f"\n📋 UNUSED CARDS ANALYSIS:")
+        lines.append(f"\n📋 UNUSED CARDS ANALYSIS:")
         
-        used_card_names = set(all_used_cards)
-        unused_cards = oracle_df[~oracle_df['name'].isin(used_card_names)]
+        unused_cards = oracle_df[~used_mask]
         
-        # Group unused by type
-        unused_creatures = unused_cards[unused_cards['Type'].str.contains('Creature', case=False, na=False)]
-        unused_lands = unused_cards[unused_cards['Type'].str.contains('Land', case=False, na=False)]
-        unused_spells = unused_cards[~unused_cards['Type'].str.contains('Creature|Land', case=False, na=False)]
+        # Group unused by type (land creatures count as both)
+        is_creature, is_land = _creature_land_masks(unused_cards['Type'])
         
-        print(f"Unused creatures: {len(unused_creatures)}")
-        print(f"Unused lands: {len(unused_lands)}")
-        print(f"Unused spells: {len(unused_spells)}")
+        lines.append(f"Unused creatures: {int(is_creature.sum())}")
+        lines.append(f"Unused lands: {int(is_land.sum())}")
+        lines.append(f"Unused spells: {int((~(is_creature | is_land)).sum())}")
         
         # Show some examples of unused cards
         if len(unused_cards) > 0:
-            print(f"\nSample unused cards:")
-            for _, card in unused_cards.head(10).iterrows():
-                print(f"  • {card['name']} ({card['Type']}) - {card['Color']}")
+            lines.append(f"\nSample unused cards:")
+            sample = unused_cards[['name', 'Type', 'Color']].head(10)
+            for name, card_type, color in sample.itertuples(index=False, name=None):
+                lines.append(f"  • {name} ({card_type}) - {color}")
+    
+    print("\n".join(lines))
     
     return {
         'total_available': total_available,
@@ -293,24 +391,28 @@ def validate_jumpstart_cube(deck_dataframes: Dict[str, pd.DataFrame], oracle_df:
     Returns:
         dict: Complete validation results
     """
-    print("🎯 COMPREHENSIVE JUMPSTART CUBE VALIDATION")
-    print("=" * 60)
+    print("\n".join(["🎯 COMPREHENSIVE JUMPSTART CUBE VALIDATION", "=" * 60]))
+    
+    # Drop empty decks and stack the rest once, sharing both across all validations
+    nonempty_decks = {theme_name: deck_df for theme_name, deck_df in deck_dataframes.items() if not deck_df.empty}
+    all_cards = _stack_decks(nonempty_decks, ['name', 'Type'])
     
     # Run all validations
-    uniqueness_result = validate_card_uniqueness(deck_dataframes)
-    constraint_result = validate_deck_constraints(deck_dataframes, all_themes, constraints)
-    distribution_result = analyze_card_distribution(deck_dataframes, oracle_df, constraints)
+    uniqueness_result = validate_card_uniqueness(nonempty_decks, all_cards)
+    constraint_result = validate_deck_constraints(nonempty_decks, all_themes, constraints, all_cards)
+    distribution_result = analyze_card_distribution(nonempty_decks, oracle_df, constraints, all_cards)
     
     # Overall validation status
     overall_valid = uniqueness_result['valid'] and constraint_result['valid']
     
-    print(f"\n🏆 OVERALL VALIDATION RESULT:")
+    lines = [f"\n🏆 OVERALL VALIDATION RESULT:"]
     if overall_valid:
-        print(f"✅ JUMPSTART CUBE CONSTRUCTION SUCCESSFUL!")
-        print(f"All constraints satisfied, no violations detected.")
+        lines.append(f"✅ JUMPSTART CUBE CONSTRUCTION SUCCESSFUL!")
+        lines.append(f"All constraints satisfied, no violations detected.")
     else:
-        print(f"❌ JUMPSTART CUBE CONSTRUCTION HAS ISSUES")
-        print(f"Please review the violations above.")
+        lines.append(f"❌ JUMPSTART CUBE CONSTRUCTION HAS ISSUES")
+        lines.append(f"Please review the violations above.")
+    print("\n".join(lines))
     
     return {
         'overall_valid': overall_valid,
@@ -328,28 +430,29 @@ def display_validation_summary(validation_results: Dict):
         validation_results: Results from validate_jumpstart_cube()
     """
     
-    print("\n📋 VALIDATION SUMMARY")
-    print("=" * 40)
+    lines = ["\n📋 VALIDATION SUMMARY", "=" * 40]
     
     # Card uniqueness
     uniqueness = validation_results['uniqueness']
-    print(f"Card Uniqueness: {'✅ PASS' if uniqueness['valid'] else '❌ FAIL'}")
-    print(f"  Total cards used: {uniqueness['total_cards']}")
-    print(f"  Unique cards: {uniqueness['unique_cards']}")
-    print(f"  Duplicates: {uniqueness['duplicate_count']}")
+    lines.append(f"Card Uniqueness: {'✅ PASS' if uniqueness['valid'] else '❌ FAIL'}")
+    lines.append(f"  Total cards used: {uniqueness['total_cards']}")
+    lines.append(f"  Unique cards: {uniqueness['unique_cards']}")
+    lines.append(f"  Duplicates: {uniqueness['duplicate_count']}")
     
     # Constraints
     constraints = validation_results['constraints']
-    print(f"\nDeck Constraints: {'✅ PASS' if constraints['valid'] else '❌ FAIL'}")
-    print(f"  Valid decks: {constraints['valid_decks']}/{constraints['total_decks']}")
-    print(f"  Violations: {len(constraints['violations'])}")
+    lines.append(f"\nDeck Constraints: {'✅ PASS' if constraints['valid'] else '❌ FAIL'}")
+    lines.append(f"  Valid decks: {constraints['valid_decks']}/{constraints['total_decks']}")
+    lines.append(f"  Violations: {len(constraints['violations'])}")
     
     # Distribution
     distribution = validation_results['distribution']
-    print(f"\nCard Distribution:")
-    print(f"  Usage rate: {distribution['usage_rate']*100:.1f}%")
-    print(f"  Complete decks: {distribution['complete_decks']}")
-    print(f"  Incomplete decks: {len(distribution['incomplete_decks'])}")
+    lines.append(f"\nCard Distribution:")
+    lines.append(f"  Usage rate: {distribution['usage_rate']*100:.1f}%")
+    lines.append(f"  Complete decks: {distribution['complete_decks']}")
+    lines.append(f"  Incomplete decks: {len(distribution['incomplete_decks'])}")
     
     # Overall
-    print(f"\nOverall Result: {'✅ SUCCESS' if validation_results['overall_valid'] else '❌ NEEDS WORK'}")
+    lines.append(f"\nOverall Result: {'✅ SUCCESS' if validation_results['overall_valid'] else '❌ NEEDS WORK'}")
+    
+    print("\n".join(lines))